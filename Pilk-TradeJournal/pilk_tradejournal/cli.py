@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+import atexit
 import csv
 import json
+import mmap
+import os
 import shutil
-from collections import defaultdict
+
+# Fastest available JSON codec: orjson, then ujson, then stdlib json.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json still works
+    orjson = None
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
 
+import numpy as np
 import typer
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional; NumPy path below is always available
+    njit = None
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -19,34 +38,224 @@ app = typer.Typer(help="Pilk Trade Journal CLI for logging, listing, searching,
 HOME = Path.home()
 JOURNAL_DIR = HOME / "trade_journal"
 TRADES_PATH = JOURNAL_DIR / "trades.json"
+TRADES_JSONL = JOURNAL_DIR / "trades.jsonl"
 SCREENSHOT_ROOT = JOURNAL_DIR / "screenshots"
 TIMEZONE = ZoneInfo("Asia/Bangkok")
 console = Console()
 
+FIELDNAMES = [
+    "timestamp",
+    "ticker",
+    "trade_type",
+    "entry_price",
+    "exit_price",
+    "position_size",
+    "pnl",
+    "pnl_pct",
+    "notes",
+    "screenshot_path",
+]
+
 
 def ensure_journal_dirs() -> None:
     JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
     SCREENSHOT_ROOT.mkdir(parents=True, exist_ok=True)
 
 
-def load_trades() -> list[dict]:
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(payload) -> bytes:
+    if orjson is not None:
+        # OPT_SERIALIZE_NUMPY: as_dict hands back np.float64 scalars from
+        # the column arrays, which orjson otherwise rejects
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    if ujson is not None:
+        return ujson.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_line(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    if ujson is not None:
+        return ujson.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+@dataclass
+class TradeStore:
+    """Structure-of-arrays view of the journal: one column per trade field."""
+
+    timestamps: list[str]
+    tickers: np.ndarray
+    trade_types: np.ndarray
+    entry_prices: np.ndarray
+    exit_prices: np.ndarray
+    position_sizes: np.ndarray
+    pnl: np.ndarray
+    pnl_pct: np.ndarray
+    notes: list[str]
+    screenshot_paths: list[str | None]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return bool(self.timestamps)
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> TradeStore:
+        n = len(records)
+        return cls(
+            timestamps=[r.get("timestamp", "") for r in records],
+            tickers=np.array([r.get("ticker", "") for r in records], dtype=object),
+            trade_types=np.array([r.get("trade_type", "") for r in records], dtype=object),
+            entry_prices=np.fromiter((r.get("entry_price", 0.0) for r in records), np.float64, n),
+            exit_prices=np.fromiter((r.get("exit_price", 0.0) for r in records), np.float64, n),
+            position_sizes=np.fromiter(
+                (r.get("position_size", 0.0) for r in records), np.float64, n
+            ),
+            pnl=np.fromiter((r.get("pnl", 0.0) for r in records), np.float64, n),
+            pnl_pct=np.fromiter((r.get("pnl_pct", 0.0) for r in records), np.float64, n),
+            notes=[r.get("notes", "") or "" for r in records],
+            screenshot_paths=[r.get("screenshot_path") for r in records],
+        )
+
+    def as_dict(self, index: int) -> dict:
+        return {
+            "timestamp": self.timestamps[index],
+            "ticker": self.tickers[index],
+            "trade_type": self.trade_types[index],
+            "entry_price": self.entry_prices[index],
+            "exit_price": self.exit_prices[index],
+            "position_size": self.position_sizes[index],
+            "pnl": self.pnl[index],
+            "pnl_pct": self.pnl_pct[index],
+            "notes": self.notes[index],
+            "screenshot_path": self.screenshot_paths[index],
+        }
+
+    def formatted_rows(self):
+        """Pre-format display columns in one pass; rendering is pure row assembly."""
+        dates = [to_local(ts) for ts in self.timestamps]
+        entries = [f"${v:,.2f}" for v in self.entry_prices]
+        exits = [f"${v:,.2f}" for v in self.exit_prices]
+        sizes = [f"{v:,.4f}" for v in self.position_sizes]
+        pnls = [format_currency(v) for v in self.pnl]
+        pcts = [format_percent(v) for v in self.pnl_pct]
+        return zip(
+            dates, self.tickers, self.trade_types, entries, exits, sizes, pnls, pcts, self.notes
+        )
+
+    def select(self, mask: np.ndarray) -> TradeStore:
+        indices = np.flatnonzero(mask)
+        return TradeStore(
+            timestamps=[self.timestamps[i] for i in indices],
+            tickers=self.tickers[indices],
+            trade_types=self.trade_types[indices],
+            entry_prices=self.entry_prices[indices],
+            exit_prices=self.exit_prices[indices],
+            position_sizes=self.position_sizes[indices],
+            pnl=self.pnl[indices],
+            pnl_pct=self.pnl_pct[indices],
+            notes=[self.notes[i] for i in indices],
+            screenshot_paths=[self.screenshot_paths[i] for i in indices],
+        )
+
+
+def _migrate_legacy_trades() -> None:
+    """One-time migration from the old trades.json array to append-only jsonl."""
+    if TRADES_JSONL.exists() or not TRADES_PATH.exists():
+        return
+    try:
+        with TRADES_PATH.open("rb") as handle:
+            data = _loads(handle.read())
+    except ValueError:
+        console.print("[yellow]Warning:[/] Corrupted legacy trades file. Skipping migration.")
+        return
+    if isinstance(data, list):
+        with TRADES_JSONL.open("wb") as handle:
+            for record in data:
+                handle.write(_dumps_line(record))
+        TRADES_PATH.rename(TRADES_PATH.with_suffix(".json.bak"))
+
+
+def load_trade_records() -> list[dict]:
     ensure_journal_dirs()
-    if not TRADES_PATH.exists():
+    _migrate_legacy_trades()
+    if not TRADES_JSONL.exists() or TRADES_JSONL.stat().st_size == 0:
         return []
-    try:
-        with TRADES_PATH.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-            if isinstance(data, list):
-                return data
-    except json.JSONDecodeError:
-        console.print("[yellow]Warning:[/] Corrupted trades file. Starting fresh list.")
-    return []
+    records = []
+    # mmap lets orjson decode straight from the page cache without an
+    # intermediate read+copy of the whole file.
+    with TRADES_JSONL.open("rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(_loads(line))
+                except ValueError:
+                    console.print("[yellow]Warning:[/] Skipping corrupted trade record.")
+    return records
+
+
+def load_trades() -> TradeStore:
+    return TradeStore.from_records(load_trade_records())
 
 
 def save_trades(trades: list[dict]) -> None:
+    """Rewrite the full journal. Only needed for compaction; use append_trade for logging."""
     ensure_journal_dirs()
-    with TRADES_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(trades, handle, indent=2, ensure_ascii=False)
+    # Group-commit: one write of the whole payload, one fsync, atomic rename.
+    payload = b"".join(_dumps_line(record) for record in trades)
+    tmp_path = TRADES_JSONL.with_suffix(".jsonl.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, TRADES_JSONL)
+    # The replace unlinked the inode the cached append fd points at; drop
+    # it so the next append_trade reopens the new file instead of writing
+    # into the orphan
+    _close_append_fd()
+
+
+_append_fd: int | None = None
+
+
+def _close_append_fd() -> None:
+    global _append_fd
+    if _append_fd is not None:
+        os.close(_append_fd)
+        _append_fd = None
+
+
+def _get_append_fd() -> int:
+    """Open the jsonl log once per process; every append is then one os.write."""
+    global _append_fd
+    if _append_fd is None:
+        ensure_journal_dirs()
+        _migrate_legacy_trades()
+        _append_fd = os.open(TRADES_JSONL, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        atexit.register(_close_append_fd)
+    return _append_fd
+
+
+def append_trade(record: dict) -> None:
+    os.write(_get_append_fd(), _dumps_line(record))
 
 
 def format_currency(value: float) -> str:
@@ -58,7 +267,8 @@ def format_percent(value: float) -> str:
     return f"{value:+.2f}%"
 
 
-def to_local(dt_str: str) -> str:
+@lru_cache(maxsize=8192)
+def _to_local_cached(dt_str: str) -> str:
     try:
         dt = datetime.fromisoformat(dt_str)
         return dt.astimezone(TIMEZONE).strftime("%Y-%m-%d %H:%M")
@@ -66,6 +276,11 @@ def to_local(dt_str: str) -> str:
         return dt_str
 
 
+def to_local(dt_str: str) -> str:
+    # fromisoformat + astimezone dominate table rendering; cache per unique string.
+    return _to_local_cached(dt_str)
+
+
 def store_screenshot(source: Path | None, trade_time: datetime) -> str | None:
     ensure_journal_dirs()
     if not source:
@@ -109,70 +324,102 @@ def build_record(
     }
 
 
+# Below this row count the numba compile cost outweighs the kernel win.
+_NUMBA_MIN_ROWS = 10_000
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _aggregate_by_ticker(pnl, ticker_ids, n_tickers):
+        counts = np.zeros(n_tickers, dtype=np.int64)
+        totals = np.zeros(n_tickers, dtype=np.float64)
+        wins = np.zeros(n_tickers, dtype=np.int64)
+        for i in range(pnl.shape[0]):
+            t = ticker_ids[i]
+            counts[t] += 1
+            totals[t] += pnl[i]
+            if pnl[i] > 0:
+                wins[t] += 1
+        return counts, totals, wins
+
+else:
+    _aggregate_by_ticker = None
+
+
+@lru_cache(maxsize=8192)
+def _parse_timestamp(timestamp: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+
 def apply_filters(
-    trades: Iterable[dict],
+    store: TradeStore,
     ticker: str | None = None,
     trade_type: str | None = None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
-) -> list[dict]:
-    results = []
-    for trade in trades:
-        if ticker and trade.get("ticker", "").lower() != ticker.lower():
-            continue
-        if trade_type and trade.get("trade_type", "").lower() != trade_type.lower():
-            continue
-        trade_time = None
-        timestamp = trade.get("timestamp")
-        if timestamp:
-            try:
-                trade_time = datetime.fromisoformat(timestamp)
-            except ValueError:
-                pass
-        if start_date and trade_time and trade_time < start_date:
-            continue
-        if end_date and trade_time and trade_time > end_date:
-            continue
-        results.append(trade)
-    return results
-
-
-def export_to_csv(trades: list[dict], path: Path) -> None:
+) -> np.ndarray:
+    """Return a boolean mask over the store for the given filters."""
+    n = len(store)
+    mask = np.ones(n, dtype=bool)
+    lower = str.lower  # bound once: LOAD_FAST in the row generators below
+    if ticker:
+        ticker_lower = lower(ticker)
+        mask &= np.fromiter((lower(t) == ticker_lower for t in store.tickers), bool, n)
+    if trade_type:
+        type_lower = lower(trade_type)
+        mask &= np.fromiter((lower(t) == type_lower for t in store.trade_types), bool, n)
+    if start_date is not None or end_date is not None:
+        # Timestamp parsing is only paid when a date window is requested.
+        parse = _parse_timestamp
+        times = [parse(ts) if ts else None for ts in store.timestamps]
+        if start_date is not None:
+            mask &= np.fromiter((t is None or t >= start_date for t in times), bool, n)
+        if end_date is not None:
+            mask &= np.fromiter((t is None or t <= end_date for t in times), bool, n)
+    return mask
+
+
+def export_to_csv(store: TradeStore, path: Path) -> None:
     path = path.expanduser()
     path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = [
-        "timestamp",
-        "ticker",
-        "trade_type",
-        "entry_price",
-        "exit_price",
-        "position_size",
-        "pnl",
-        "pnl_pct",
-        "notes",
-        "screenshot_path",
-    ]
     with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        for trade in trades:
-            writer.writerow({key: trade.get(key, "") for key in fieldnames})
-    console.print(f"[green]Exported {len(trades)} trades to {path} (CSV).[/]")
+        writer = csv.writer(handle)
+        writer.writerow(FIELDNAMES)
+        # Zip the columns straight into writerows; no per-row dict rebuild.
+        writer.writerows(
+            zip(
+                store.timestamps,
+                store.tickers,
+                store.trade_types,
+                store.entry_prices,
+                store.exit_prices,
+                store.position_sizes,
+                store.pnl,
+                store.pnl_pct,
+                store.notes,
+                (path_ or "" for path_ in store.screenshot_paths),
+            )
+        )
+    console.print(f"[green]Exported {len(store)} trades to {path} (CSV).[/]")
 
 
-def export_to_json(trades: list[dict], path: Path) -> None:
+def export_to_json(store: TradeStore, path: Path) -> None:
     path = path.expanduser()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(trades, handle, indent=2, ensure_ascii=False)
-    console.print(f"[green]Exported {len(trades)} trades to {path} (JSON).[/]")
+    records = [store.as_dict(index) for index in range(len(store))]
+    with path.open("wb") as handle:
+        handle.write(_dumps(records))
+    console.print(f"[green]Exported {len(store)} trades to {path} (JSON).[/]")
 
 
-def print_table(trades: list[dict], title: str = "Trades") -> None:
-    if not trades:
+def print_table(store: TradeStore, title: str = "Trades") -> None:
+    if not store:
         console.print("[yellow]No trades to show.[/]")
         return
-    table = Table(title=f"{title} ({len(trades)})", show_lines=False)
+    table = Table(title=f"{title} ({len(store)})", show_lines=False)
     table.add_column("Date", style="cyan", no_wrap=True)
     table.add_column("Ticker", style="bold magenta")
     table.add_column("Type", style="bold")
@@ -183,18 +430,8 @@ def print_table(trades: list[dict], title: str = "Trades") -> None:
     table.add_column("PnL %", justify="right")
     table.add_column("Notes", style="dim")
 
-    for trade in trades:
-        table.add_row(
-            to_local(trade.get("timestamp", "")),
-            trade.get("ticker", ""),
-            trade.get("trade_type", ""),
-            f"${trade.get('entry_price', 0):,.2f}",
-            f"${trade.get('exit_price', 0):,.2f}",
-            f"{trade.get('position_size', 0):,.4f}",
-            format_currency(trade.get("pnl", 0.0)),
-            format_percent(trade.get("pnl_pct", 0.0)),
-            trade.get("notes", ""),
-        )
+    for row in store.formatted_rows():
+        table.add_row(*row)
     console.print(table)
 
 
@@ -238,9 +475,7 @@ def log(
         pnl=pnl,
         pnl_pct=pnl_pct,
     )
-    trades = load_trades()
-    trades.append(record)
-    save_trades(trades)
+    append_trade(record)
 
     console.print("\n📝 [bold]TRADE LOGGED[/bold]\n")
     console.print(f"Ticker: {record['ticker']}")
@@ -263,18 +498,17 @@ def list_trades(
     export_csv: Path | None = typer.Option(None, "--export-csv", help="Export filtered list to CSV"),
     export_json: Path | None = typer.Option(None, "--export-json", help="Export filtered list to JSON"),
 ) -> None:
-    trades = load_trades()
-    if not trades:
+    store = load_trades()
+    if not store:
         console.print("[yellow]No trades logged yet.[/]")
         raise typer.Exit()
     start_dt = datetime.fromisoformat(start_date) if start_date else None
     end_dt = (
         datetime.fromisoformat(end_date) + timedelta(days=1) if end_date else None
     )
-    filtered = apply_filters(trades, ticker, trade_type, start_dt, end_dt)
+    filtered = store.select(apply_filters(store, ticker, trade_type, start_dt, end_dt))
     print_table(filtered, title="Trade Log")
-    total = sum(trade.get("pnl", 0.0) for trade in filtered)
-    console.print(f"[bold]Total PnL:[/] {format_currency(total)}")
+    console.print(f"[bold]Total PnL:[/] {format_currency(float(filtered.pnl.sum()))}")
     if export_csv:
         export_to_csv(filtered, export_csv)
     if export_json:
@@ -289,23 +523,27 @@ def search(
     min_pnl: float | None = typer.Option(None, "--min-pnl", help="Minimum PnL"),
     max_pnl: float | None = typer.Option(None, "--max-pnl", help="Maximum PnL"),
 ) -> None:
-    trades = load_trades()
-    if not trades:
+    store = load_trades()
+    if not store:
         console.print("[yellow]No trades logged yet.[/]")
         raise typer.Exit()
-    normalized_query = query.lower()
-    results = [trade for trade in trades if normalized_query in trade.get("notes", "").lower()]
     if winners and losers:
         typer.echo("Cannot filter for both winners and losers simultaneously.")
         raise typer.Exit(code=1)
+    normalized_query = query.lower()
+    # Build one boolean mask instead of filtering the list in sequential passes.
+    mask = np.fromiter(
+        (normalized_query in note.lower() for note in store.notes), dtype=bool, count=len(store)
+    )
     if winners:
-        results = [trade for trade in results if trade.get("pnl", 0.0) > 0]
+        mask &= store.pnl > 0
     if losers:
-        results = [trade for trade in results if trade.get("pnl", 0.0) < 0]
+        mask &= store.pnl < 0
     if min_pnl is not None:
-        results = [trade for trade in results if trade.get("pnl", 0.0) >= min_pnl]
+        mask &= store.pnl >= min_pnl
     if max_pnl is not None:
-        results = [trade for trade in results if trade.get("pnl", 0.0) <= max_pnl]
+        mask &= store.pnl <= max_pnl
+    results = store.select(mask)
     if not results:
         console.print("[yellow]No trades matched your search criteria.[/]")
         raise typer.Exit()
@@ -314,16 +552,16 @@ def search(
 
 @app.command()
 def stats() -> None:
-    trades = load_trades()
-    if not trades:
+    store = load_trades()
+    if not store:
         console.print("[yellow]No trades logged yet.[/]")
         raise typer.Exit()
-    total_pnl = sum(trade.get("pnl", 0.0) for trade in trades)
-    winners = [trade for trade in trades if trade.get("pnl", 0.0) > 0]
-    losers = [trade for trade in trades if trade.get("pnl", 0.0) < 0]
-    win_rate = len(winners) / len(trades) * 100 if trades else 0
-    avg_win = sum(trade.get("pnl", 0.0) for trade in winners) / len(winners) if winners else 0
-    avg_loss = sum(trade.get("pnl", 0.0) for trade in losers) / len(losers) if losers else 0
+    wins_mask = store.pnl > 0
+    loss_mask = store.pnl < 0
+    total_pnl = float(store.pnl.sum())
+    win_rate = wins_mask.sum() / len(store) * 100
+    avg_win = float(store.pnl[wins_mask].mean()) if wins_mask.any() else 0
+    avg_loss = float(store.pnl[loss_mask].mean()) if loss_mask.any() else 0
 
     panel_text = (
         f"Total PnL: [bold]{format_currency(total_pnl)}[/]\n"
@@ -333,14 +571,18 @@ def stats() -> None:
     )
     console.print(Panel(panel_text, title="Overview", expand=False))
 
-    breakdown: dict[str, dict[str, float | int]] = defaultdict(lambda: {"count": 0, "total_pnl": 0.0, "wins": 0})
-    for trade in trades:
-        ticker = trade.get("ticker", "UNKNOWN")
-        bucket = breakdown[ticker]
-        bucket["count"] += 1
-        bucket["total_pnl"] += trade.get("pnl", 0.0)
-        if trade.get("pnl", 0.0) > 0:
-            bucket["wins"] += 1
+    # Group-by-ticker over integer codes instead of a per-trade dict loop.
+    tickers = np.array([t or "UNKNOWN" for t in store.tickers], dtype=object)
+    unique_tickers, ticker_ids = np.unique(tickers, return_inverse=True)
+    n_tickers = len(unique_tickers)
+    if _aggregate_by_ticker is not None and len(store) >= _NUMBA_MIN_ROWS:
+        counts, totals, wins = _aggregate_by_ticker(
+            store.pnl, ticker_ids.astype(np.int64), n_tickers
+        )
+    else:
+        counts = np.bincount(ticker_ids, minlength=n_tickers)
+        totals = np.bincount(ticker_ids, weights=store.pnl, minlength=n_tickers)
+        wins = np.bincount(ticker_ids[store.pnl > 0], minlength=n_tickers)
 
     breakdown_table = Table(title="By Ticker")
     breakdown_table.add_column("Ticker")
@@ -349,11 +591,8 @@ def stats() -> None:
     breakdown_table.add_column("Total PnL", justify="right")
     breakdown_table.add_column("Avg PnL", justify="right")
 
-    for ticker, data in sorted(breakdown.items()):
-        count = data["count"]
-        total = data["total_pnl"]
-        wins = data["wins"]
-        win_pct = wins / count * 100 if count else 0
+    for ticker, count, total, win_count in zip(unique_tickers, counts, totals, wins):
+        win_pct = win_count / count * 100 if count else 0
         avg = total / count if count else 0
         breakdown_table.add_row(
             ticker,
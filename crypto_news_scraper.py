@@ -5,8 +5,13 @@ Pulls headlines from crypto news feeds and scores sentiment.
 """
 
 import feedparser
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from datetime import datetime
-import re
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional; regex fallback below
+    ahocorasick = None
 
 # RSS Feeds
 RSS_FEEDS = [
@@ -27,11 +32,47 @@ BEARISH = ["bearish", "crash", "dump", "plunge", "drop", "fall", "negative", "be
             "concern", "warning", "risk", "downtrend", "collapse", "sell-off", "pressure"]
 
 
+# Deduplicated keyword sets; the raw lists contain repeats ("rally", "dump")
+# that would otherwise double-count.
+BULLISH_SET = frozenset(BULLISH)
+BEARISH_SET = frozenset(BEARISH)
+
+
+def _build_automaton():
+    """Compile both keyword sets into one Aho-Corasick automaton."""
+    automaton = ahocorasick.Automaton()
+    for word in BULLISH_SET:
+        automaton.add_word(word, "bull")
+    for word in BEARISH_SET:
+        automaton.add_word(word, "bear")
+    automaton.make_automaton()
+    return automaton
+
+
+def _count_keywords(text_lower, words):
+    """Count every keyword occurrence as an unanchored substring — the
+    same semantics the automaton path uses, so scores do not depend on
+    whether pyahocorasick is installed."""
+    return sum(text_lower.count(word) for word in words)
+
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+
 def score_sentiment(text):
-    """Simple keyword-based sentiment scoring."""
+    """Keyword-based sentiment scoring in a single scan of the text."""
     text_lower = text.lower()
-    bullish_count = sum(1 for word in BULLISH if word in text_lower)
-    bearish_count = sum(1 for word in BEARISH if word in text_lower)
+    if _AUTOMATON is not None:
+        bullish_count = 0
+        bearish_count = 0
+        for _, tag in _AUTOMATON.iter(text_lower):
+            if tag == "bull":
+                bullish_count += 1
+            else:
+                bearish_count += 1
+    else:
+        bullish_count = _count_keywords(text_lower, BULLISH_SET)
+        bearish_count = _count_keywords(text_lower, BEARISH_SET)
 
     if bullish_count > bearish_count:
         return "bullish", bullish_count - bearish_count
@@ -41,33 +82,52 @@ def score_sentiment(text):
 
 
 def fetch_news(max_per_feed=5):
-    """Fetch and parse news from RSS feeds."""
+    """Fetch and parse news from RSS feeds concurrently."""
     headlines = []
 
-    for source, url in RSS_FEEDS:
+    # Feeds are network-bound, so fetch them all in parallel. No context
+    # manager: its exit would join threads and block on the very feed
+    # that timed out.
+    executor = ThreadPoolExecutor(max_workers=len(RSS_FEEDS))
+    try:
+        futures = {
+            executor.submit(feedparser.parse, url): source
+            for source, url in RSS_FEEDS
+        }
+
+        # Errors are handled per feed; a timeout only stops the wait and
+        # keeps everything already fetched
         try:
-            print(f"Fetching {source}...")
-            feed = feedparser.parse(url)
-
-            for entry in feed.entries[:max_per_feed]:
-                title = entry.title
-                url_link = entry.link
-                published = entry.get("published", "Unknown")
-
-                # Score sentiment
-                sentiment, score = score_sentiment(title + " " + entry.get("summary", ""))
-
-                headlines.append({
-                    "source": source,
-                    "title": title,
-                    "url": url_link,
-                    "published": published,
-                    "sentiment": sentiment,
-                    "score": score
-                })
-
-        except Exception as e:
-            print(f"Error fetching {source}: {e}")
+            for future in as_completed(futures, timeout=30):
+                source = futures[future]
+                try:
+                    feed = future.result()
+                    print(f"Fetched {source}")
+
+                    for entry in feed.entries[:max_per_feed]:
+                        title = entry.title
+                        url_link = entry.link
+                        published = entry.get("published", "Unknown")
+
+                        # Score sentiment
+                        sentiment, score = score_sentiment(title + " " + entry.get("summary", ""))
+
+                        headlines.append({
+                            "source": source,
+                            "title": title,
+                            "url": url_link,
+                            "published": published,
+                            "sentiment": sentiment,
+                            "score": score
+                        })
+
+                except Exception as e:
+                    print(f"Error fetching {source}: {e}")
+        except FuturesTimeout:
+            late = [source for future, source in futures.items() if not future.done()]
+            print(f"Timed out waiting for: {', '.join(late)}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return headlines
 
@@ -12,24 +12,43 @@ Changes:
 - Timeout management per provider
 """
 
+import atexit
 import json
+import socket
 import sys
 import logging
+import threading
 import time
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import wraps
+from urllib.parse import urlsplit
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional; response.json() still works
+    orjson = None
+
+try:  # Only advertise br when urllib3 can actually decode it
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, br'
+except ImportError:  # pragma: no cover - optional
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
 # Configuration
 STORAGE_FILE = Path.home() / ".openclaw/workspace/memory/pilk-delta.json"
 
+# Shared RNG for backoff jitter; avoids per-retry random.uniform frames
+_RNG = random.Random()
+
 # =============================================================================
 # ERROR HANDLING SCHEMA
 # =============================================================================
@@ -47,9 +66,13 @@ class APIErrorType(Enum):
     UNKNOWN = "unknown"           # Unclassified errors
 
 
-@dataclass
+@dataclass(slots=True)
 class APIError(Exception):
-    """Structured API error with context for debugging and recovery."""
+    """Structured API error with context for debugging and recovery.
+
+    Kept mutable (not frozen) because the request path fills in
+    provider/url after classification.
+    """
     error_type: APIErrorType
     message: str
     provider: str
@@ -107,8 +130,9 @@ class CircuitState:
     """Circuit breaker state for a provider."""
     is_open: bool = False
     failure_count: int = 0
-    last_failure: Optional[datetime] = None
-    last_success: Optional[datetime] = None
+    # Monotonic seconds (time.monotonic()); cheaper than datetime math in the hot path
+    last_failure: Optional[float] = None
+    last_success: Optional[float] = None
     
     # Configuration
     failure_threshold: int = 3
@@ -138,7 +162,7 @@ class CircuitBreaker:
         
         # Check if recovery timeout has passed
         if circuit.last_failure:
-            elapsed = (datetime.now() - circuit.last_failure).total_seconds()
+            elapsed = time.monotonic() - circuit.last_failure
             if elapsed >= circuit.recovery_timeout:
                 logging.info(f"Circuit breaker entering half-open state for {provider}")
                 return True  # Allow test request
@@ -148,7 +172,7 @@ class CircuitBreaker:
     def record_success(self, provider: str) -> None:
         """Record successful request, potentially closing circuit."""
         circuit = self._get_circuit(provider)
-        circuit.last_success = datetime.now()
+        circuit.last_success = time.monotonic()
         
         if circuit.is_open:
             logging.info(f"Circuit breaker closed for {provider}")
@@ -159,7 +183,7 @@ class CircuitBreaker:
         """Record failed request, potentially opening circuit."""
         circuit = self._get_circuit(provider)
         circuit.failure_count += 1
-        circuit.last_failure = datetime.now()
+        circuit.last_failure = time.monotonic()
         
         if circuit.failure_count >= circuit.failure_threshold:
             if not circuit.is_open:
@@ -183,9 +207,23 @@ class ProviderConfig:
     jitter: float = 0.1  # Random jitter factor (0-1)
     headers: Dict[str, str] = field(default_factory=dict)
     
-    # Rate limiting
+    # Rate limiting (token bucket: capacity allows short bursts)
     rate_limit_per_second: Optional[float] = None
-    last_request_time: float = 0.0
+    burst_capacity: float = 5.0
+    # Hard cap on response body size; oversized payloads abort early
+    max_response_bytes: int = 10 * 1024 * 1024
+    # Token balance; goes negative when the bucket is dry, with each unit
+    # of debt representing one waiter queued at 1/rate spacing
+    tokens: float = field(default=0.0, repr=False)
+    last_refill: float = field(default=0.0, repr=False)
+    _rate_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        # Start with a full bucket so the first burst is not throttled
+        self.tokens = self.burst_capacity
+        self.last_refill = time.monotonic()
+        # Exponential backoff bases, computed once instead of per retry
+        self._backoff_table = [self.backoff_base * (2 ** a) for a in range(self.max_retries)]
 
 
 class ProviderRegistry:
@@ -225,21 +263,74 @@ class ProviderRegistry:
     }
     
     def __init__(self, custom_providers: Optional[Dict[str, ProviderConfig]] = None):
-        self.providers = {**self.DEFAULT_PROVIDERS}
+        merged = {**self.DEFAULT_PROVIDERS}
         if custom_providers:
-            self.providers.update(custom_providers)
-    
+            merged.update(custom_providers)
+        # Intern names once at registration: circuit-breaker and session
+        # dicts then probe on pointer identity instead of re-hashing strings
+        self.providers = {}
+        for name, config in merged.items():
+            config.name = sys.intern(config.name)
+            self.providers[sys.intern(name)] = config
+        self._rebuild_url_index()
+
     def get(self, name: str) -> Optional[ProviderConfig]:
         return self.providers.get(name)
-    
+
     def add(self, config: ProviderConfig) -> None:
+        config.name = sys.intern(config.name)
         self.providers[config.name] = config
+        self._rebuild_url_index()
+
+    def _rebuild_url_index(self) -> None:
+        # O(1) host lookup for full URLs, with a longest-prefix fallback for
+        # providers sharing a host
+        self._netloc_index = {
+            urlsplit(config.base_url).netloc: name
+            for name, config in self.providers.items()
+            if config.base_url
+        }
+        self._prefix_index = sorted(
+            ((config.base_url, name) for name, config in self.providers.items() if config.base_url),
+            key=lambda item: -len(item[0]),
+        )
+
+    def match_url(self, url: str) -> Optional[str]:
+        """Resolve a full URL to a provider name."""
+        # A host hit only counts if the URL sits under the provider's base
+        # path; callers slice the endpoint off base_url, so a bare netloc
+        # match would produce a garbage endpoint
+        name = self._netloc_index.get(urlsplit(url).netloc)
+        if name and url.startswith(self.providers[name].base_url):
+            return name
+        for base_url, name in self._prefix_index:
+            if url.startswith(base_url):
+                return name
+        return None
 
 
 # =============================================================================
 # ENHANCED API CLIENT
 # =============================================================================
 
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive so NAT/load-balancer timeouts
+    don't silently kill pooled connections between bursts."""
+
+    _SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux only
+        _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 30))
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self._SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
 class APIClient:
     """
     Robust API client with multi-provider fallback, retries, and circuit breaker.
@@ -254,21 +345,41 @@ class APIClient:
         self.providers = provider_registry or ProviderRegistry()
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
         self.logger = logger or logging.getLogger(__name__)
-        
-        # Create session with connection pooling
-        self.session = requests.Session()
-        adapter = HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=20,
-            max_retries=Retry(
-                total=0,  # We handle retries ourselves
-                connect=2,
-                read=2,
-                status=0,
+
+        # One pooled keep-alive session per provider, built lazily
+        self._sessions: Dict[str, requests.Session] = {}
+
+        # Request collapsing: concurrent identical GETs share one Future so
+        # N callers cost one network round-trip
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _session_for(self, config: ProviderConfig) -> requests.Session:
+        """Get or build the pooled session for a provider, amortizing TLS setup."""
+        session = self._sessions.get(config.name)
+        if session is None:
+            session = requests.Session()
+            # Advertise brotli alongside gzip when available; option-chain
+            # JSON compresses 5-10x under br vs 3-4x under gzip
+            session.headers.update({
+                'Accept': 'application/json',
+                'Accept-Encoding': _ACCEPT_ENCODING,
+            })
+            adapter = KeepAliveAdapter(
+                pool_connections=max(10, len(self.providers.providers)),
+                pool_maxsize=64,
+                max_retries=Retry(
+                    total=0,  # We handle retries ourselves
+                    connect=2,
+                    read=2,
+                    status=0,
+                )
             )
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._sessions[config.name] = session
+            atexit.register(session.close)
+        return session
     
     def _calculate_backoff(
         self, 
@@ -281,11 +392,20 @@ class APIClient:
             return float(retry_after)
         
         # Exponential backoff with jitter
-        base = config.backoff_base * (2 ** attempt)
-        jitter = random.uniform(0, config.jitter) * base
+        table = config._backoff_table
+        base = table[attempt] if attempt < len(table) else config.backoff_base * (2 ** attempt)
+        jitter = _RNG.random() * config.jitter * base
         backoff = min(base + jitter, config.backoff_max)
         return backoff
     
+    # Status-code dispatch table; one hash lookup instead of a branch chain
+    _STATUS_MAP = {
+        401: (APIErrorType.AUTH, "Authentication failed"),
+        403: (APIErrorType.AUTH, "Authentication failed"),
+        404: (APIErrorType.NOT_FOUND, "Resource not found"),
+        429: (APIErrorType.RATE_LIMIT, "Rate limit exceeded"),
+    }
+
     def _classify_error(self, exc: Exception, response: Optional[requests.Response]) -> APIError:
         """Classify an exception into a structured APIError."""
         provider = "unknown"
@@ -314,39 +434,29 @@ class APIClient:
             provider = getattr(response, '_provider', 'unknown')
             url = response.url
             
-            if status == 429:
-                retry_after = response.headers.get('Retry-After')
-                return APIError(
-                    error_type=APIErrorType.RATE_LIMIT,
-                    message="Rate limit exceeded",
-                    provider=provider,
-                    url=url,
-                    status_code=status,
-                    retry_after=int(retry_after) if retry_after else None,
-                )
-            
-            if status in (401, 403):
+            entry = self._STATUS_MAP.get(status)
+            if entry:
+                error_type, message = entry
+                retry_after = None
+                if status == 429:
+                    header = response.headers.get('Retry-After')
+                    retry_after = int(header) if header else None
                 return APIError(
-                    error_type=APIErrorType.AUTH,
-                    message="Authentication failed",
+                    error_type=error_type,
+                    message=message,
                     provider=provider,
                     url=url,
                     status_code=status,
+                    retry_after=retry_after,
                 )
-            
-            if status == 404:
-                return APIError(
-                    error_type=APIErrorType.NOT_FOUND,
-                    message="Resource not found",
-                    provider=provider,
-                    url=url,
-                    status_code=status,
-                )
-            
+
             if 500 <= status < 600:
+                # Constant message; the status code is already carried in
+                # status_code and rendered by __str__, so no f-string needed
+                # on a path the retry loop usually swallows
                 return APIError(
                     error_type=APIErrorType.SERVER,
-                    message=f"Server error: {status}",
+                    message="Server error",
                     provider=provider,
                     url=url,
                     status_code=status,
@@ -361,13 +471,25 @@ class APIClient:
         )
     
     def _respect_rate_limit(self, config: ProviderConfig) -> None:
-        """Enforce rate limiting for a provider."""
-        if config.rate_limit_per_second:
-            min_interval = 1.0 / config.rate_limit_per_second
-            elapsed = time.time() - config.last_request_time
-            if elapsed < min_interval:
-                time.sleep(min_interval - elapsed)
-            config.last_request_time = time.time()
+        """Enforce rate limiting for a provider via a token bucket."""
+        rate = config.rate_limit_per_second
+        if not rate:
+            return
+        with config._rate_lock:
+            now = time.monotonic()
+            config.tokens = min(
+                config.burst_capacity, config.tokens + (now - config.last_refill) * rate
+            )
+            config.last_refill = now
+            # Always debit: a negative balance is the queue of waiters, so
+            # refill credits pay that debt before fresh arrivals pass and
+            # sustained throughput stays capped at the configured rate.
+            # Each waiter's deficit is 1/rate deeper than the previous
+            # one's, which staggers wake-ups at exactly the cadence
+            config.tokens -= 1.0
+            wait = -config.tokens / rate if config.tokens < 0.0 else 0.0
+        if wait > 0.0:
+            time.sleep(wait)
     
     def _make_request(
         self,
@@ -379,23 +501,49 @@ class APIClient:
         self._respect_rate_limit(config)
         
         try:
-            response = self.session.get(
+            response = self._session_for(config).get(
                 url,
                 params=params,
                 timeout=config.timeout,
                 headers=config.headers or None,
+                stream=True,
             )
             response._provider = config.name  # Track provider for error classification
-            
+
             response.raise_for_status()
-            
-            # Validate JSON response
+
+            # Enforce the size cap before buffering: trust Content-Length when
+            # present, otherwise read at most limit+1 bytes and check
+            limit = config.max_response_bytes
+            declared = response.headers.get('Content-Length')
+            if declared and int(declared) > limit:
+                response.close()
+                raise APIError(
+                    error_type=APIErrorType.INVALID_RESPONSE,
+                    message=f"Response exceeds {limit} bytes",
+                    provider=config.name,
+                    url=url,
+                )
+            body = response.raw.read(limit + 1, decode_content=True)
+            if len(body) > limit:
+                response.close()
+                raise APIError(
+                    error_type=APIErrorType.INVALID_RESPONSE,
+                    message=f"Response exceeds {limit} bytes",
+                    provider=config.name,
+                    url=url,
+                )
+
+            # Validate JSON response (orjson parses large chain payloads in C)
             try:
-                data = response.json()
-            except json.JSONDecodeError as exc:
+                if orjson is not None:
+                    data = orjson.loads(body)
+                else:
+                    data = json.loads(body)
+            except ValueError as exc:
                 raise APIError(
                     error_type=APIErrorType.INVALID_RESPONSE,
-                    message=f"Invalid JSON response: {exc}",
+                    message="Invalid JSON response",
                     provider=config.name,
                     url=url,
                     original_exception=exc,
@@ -433,6 +581,55 @@ class APIClient:
         Raises:
             APIError: When all providers fail
         """
+        # Collapse concurrent identical requests onto one Future. List
+        # params (requests' repeated-key form) become tuples so the key
+        # stays hashable
+        key = (
+            provider or 'deribit',
+            endpoint,
+            frozenset(
+                (k, tuple(v) if isinstance(v, (list, set)) else v)
+                for k, v in params.items()
+            ) if params else None,
+            tuple(fallback_providers) if fallback_providers else None,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # Exotic unhashable param value: skip collapsing for this call
+            return self._do_get(endpoint, params, provider, fallback_providers)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._do_get(endpoint, params, provider, fallback_providers)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _do_get(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+        provider: Optional[str],
+        fallback_providers: Optional[List[str]],
+    ) -> dict:
+        """Uncollapsed GET: provider fallback and retry loop."""
         provider_name = provider or 'deribit'
         providers_to_try = [provider_name]
         
@@ -440,8 +637,7 @@ class APIClient:
             providers_to_try.extend(fallback_providers)
         
         # Remove duplicates while preserving order
-        seen = set()
-        providers_to_try = [p for p in providers_to_try if not (p in seen or seen.add(p))]
+        providers_to_try = list(dict.fromkeys(providers_to_try))
         
         last_error: Optional[APIError] = None
         
@@ -492,7 +688,7 @@ class APIClient:
         # All providers failed
         if last_error:
             raise last_error
-        
+
         raise APIError(
             error_type=APIErrorType.UNKNOWN,
             message="No providers available",
@@ -500,6 +696,35 @@ class APIClient:
             url=endpoint,
         )
 
+    def get_many(
+        self,
+        request_specs: List[tuple],
+        max_workers: int = 8,
+    ) -> List[Union[dict, APIError]]:
+        """
+        Fan out multiple GET requests concurrently.
+
+        Args:
+            request_specs: List of (endpoint, params, provider) tuples
+            max_workers: Upper bound on concurrent requests
+
+        Returns:
+            list: Results in input order; failed requests yield their
+                  APIError instead of raising (gather-style semantics)
+        """
+        if not request_specs:
+            return []
+
+        def one(spec):
+            endpoint, params, provider = spec
+            try:
+                return self.get(endpoint, params, provider)
+            except APIError as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(request_specs))) as pool:
+            return list(pool.map(one, request_specs))
+
 
 # =============================================================================
 # CONVENIENCE FUNCTION (DROP-IN REPLACEMENT)
@@ -559,13 +784,14 @@ def api_get(
     
     # Auto-detect provider from URL if it's a full URL
     if url.startswith('http'):
-        for name, config in client.providers.providers.items():
-            if url.startswith(config.base_url):
-                endpoint = url[len(config.base_url):]
-                return client.get(
-                    endpoint, params, name, fallback_providers
-                )
-        
+        name = client.providers.match_url(url)
+        if name:
+            config = client.providers.get(name)
+            endpoint = url[len(config.base_url):]
+            return client.get(
+                endpoint, params, name, fallback_providers
+            )
+
         # Unknown URL, try direct request
         config = ProviderConfig(name='direct', base_url='', timeout=30.0)
         return client._make_request(url, params, config)
